@@ -0,0 +1 @@
+"""Banc d'essai de l'application : doublures locales de Supabase et Spoonacular, mesures par page."""
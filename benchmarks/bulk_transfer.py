@@ -0,0 +1,126 @@
+"""Banc d'essai de l'import et de l'export en lot contre la base Supabase en mémoire.
+
+Avec une latence simulée par requête, mesure le débit (lignes/s) de `import_file` en CSV et
+en Parquet, le compare à des insertions ligne par ligne, vérifie qu'un second import du même
+fichier ne crée aucune ligne, puis mesure `export_file` dans les deux formats. Code de sortie 1
+si un contrôle échoue.
+
+    python -m benchmarks.bulk_transfer --rows 20000 --latency 0.01
+"""
+import argparse
+import io
+import json
+import os
+import random
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import pandas as pd  # noqa: E402
+
+from benchmarks.fakes import FakeSupabase  # noqa: E402
+from repository import TRAINING_TYPES  # noqa: E402
+from transfer import export_file, import_file  # noqa: E402
+
+USER_ID = "bench-user"
+INVALID_ROWS = 2  # Lignes volontairement invalides du fichier
+
+
+def training_file(rows, seed=0):
+    """Entraînements synthétiques ; les deux premières lignes sont invalides."""
+    rng = random.Random(seed)
+    frame = pd.DataFrame({
+        "date": [f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}" for _ in range(rows)],
+        "training_type": [rng.choice(TRAINING_TYPES) for _ in range(rows)],
+        "duration": [str(rng.randint(10, 120)) for _ in range(rows)],
+        "calories_burned": [rng.randint(50, 900) for _ in range(rows)],
+    })
+    frame.loc[0, "duration"] = "abc"
+    frame.loc[1, "training_type"] = "Yoga"
+    return frame
+
+
+def timed_import(db, data, file_name):
+    before = db.counters()["queries"]
+    start = time.perf_counter()
+    summary = import_file(db.session_client(), USER_ID, "trainings", io.BytesIO(data), file_name)
+    elapsed = time.perf_counter() - start
+    return {
+        "seconds": round(elapsed, 2),
+        "rows_per_s": round((summary["imported"] + summary["skipped"]) / elapsed),
+        "requests": db.counters()["queries"] - before,
+        "imported": summary["imported"],
+        "skipped": summary["skipped"],
+        "rejected": summary["rejected"],
+    }
+
+
+def run(rows, latency, sample=200):
+    frame = training_file(rows)
+    csv = frame.to_csv(index=False).encode()
+    parquet = io.BytesIO()
+    frame.iloc[INVALID_ROWS:].astype({"duration": "int64"}).to_parquet(parquet, index=False)
+    valid = rows - INVALID_ROWS
+
+    results, checks = {}, []
+    db = FakeSupabase(latency=latency)
+    results["import_csv"] = timed_import(db, csv, "trainings.csv")
+    checks.append(("import CSV", results["import_csv"]["imported"] == valid
+                   and results["import_csv"]["rejected"] == INVALID_ROWS))
+    results["reimport_csv"] = timed_import(db, csv, "trainings.csv")
+    checks.append(("réimport sans doublon", len(db.tables["trainings"]) == valid
+                   and results["reimport_csv"]["skipped"] == valid))
+
+    # Référence : une insertion par ligne, mesurée sur un échantillon
+    client = db.session_client()
+    start = time.perf_counter()
+    for record in frame.iloc[INVALID_ROWS:INVALID_ROWS + sample].to_dict("records"):
+        client.table("trainings").insert({**record, "user_id": "single-inserts"}).execute()
+    results["single_inserts_rows_per_s"] = round(sample / (time.perf_counter() - start))
+
+    parquet_db = FakeSupabase(latency=latency)
+    results["import_parquet"] = timed_import(parquet_db, parquet.getvalue(), "trainings.parquet")
+    checks.append(("import Parquet", results["import_parquet"]["imported"] == valid))
+
+    for file_format in ("csv", "parquet"):
+        start = time.perf_counter()
+        path = export_file(db.session_client(), USER_ID, "trainings", file_format)
+        elapsed = time.perf_counter() - start
+        try:
+            exported = len(pd.read_csv(path) if file_format == "csv" else pd.read_parquet(path))
+        finally:
+            os.remove(path)
+        results[f"export_{file_format}"] = {"seconds": round(elapsed, 2), "rows_per_s": round(exported / elapsed)}
+        checks.append((f"export {file_format}", exported == valid))
+    return results, checks
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=20000, help="Lignes du fichier importé")
+    parser.add_argument("--latency", type=float, default=0.01, help="Latence simulée par requête (s)")
+    parser.add_argument("--output", default=None, help="Fichier JSON des résultats (facultatif)")
+    args = parser.parse_args(argv)
+
+    results, checks = run(args.rows, args.latency)
+    for case in ("import_csv", "reimport_csv", "import_parquet"):
+        result = results[case]
+        print(
+            f"{case:<15} {result['rows_per_s']:>8} lignes/s  {result['requests']:>4} requêtes  "
+            f"importées {result['imported']}, déjà présentes {result['skipped']}, rejetées {result['rejected']}"
+        )
+    print(f"{'insertions une à une':<15} {results['single_inserts_rows_per_s']:>8} lignes/s")
+    for file_format in ("csv", "parquet"):
+        print(f"{'export_' + file_format:<15} {results['export_' + file_format]['rows_per_s']:>8} lignes/s")
+    for name, ok in checks:
+        print(f"{'OK   ' if ok else 'ÉCHEC'} {name}")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"args": vars(args), "results": results}, f, indent=2)
+    return 0 if all(ok for _, ok in checks) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,143 @@
+"""Banc d'essai mémoire des graphiques « Visualisations avancées » sur de nombreuses réexécutions.
+
+Chaque cas tourne dans son propre processus et redessine les deux graphiques de la page à
+chaque réexécution, sur les mêmes données :
+
+- pyplot : ancien code, figures globales jamais fermées (premier graphique dessiné deux fois) ;
+- figure : charts.py (API objet de matplotlib), sans cache ;
+- cache : les rendus mis en cache par la page (st.cache_data).
+
+    python -m benchmarks.chart_memory --reruns 1000 --output charts.json
+"""
+import argparse
+import io
+import json
+import os
+import subprocess
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CASES = ["pyplot", "figure", "cache"]
+USER_ID = "bench-user"
+
+
+def page_data(rows):
+    """Séries de la page, calculées comme elle le fait, pour un historique de `rows` lignes."""
+    from benchmarks.fakes import FakeSupabase, seed_user
+    from frames import meals_frame, trainings_frame
+    from timeseries import calorie_series, downsample
+
+    db = FakeSupabase()
+    seed_user(db, USER_ID, rows, days=rows)
+    trainings, meals = trainings_frame(db.tables["trainings"]), meals_frame(db.tables["meals"])
+    series = calorie_series(trainings, meals)
+    return (
+        downsample(series["burned"]), downsample(series["consumed"]), downsample(series["rolling_net"]),
+        trainings["duration"].to_numpy(),
+    )
+
+
+def legacy_rerun(burned, consumed, rolling_net, durations):
+    """Ancien rendu : état global de pyplot, figures jamais fermées."""
+    import matplotlib.pyplot as plt
+
+    for _ in range(2):  # Le bloc était dupliqué : le premier graphique était dessiné deux fois
+        plt.figure(figsize=(10, 5))
+        plt.plot(burned.index, burned.to_numpy(), label="Calories brûlées", marker="o")
+        plt.plot(consumed.index, consumed.to_numpy(), label="Calories consommées", marker="o")
+        plt.legend()
+        plt.savefig(io.BytesIO(), format="png")
+    plt.figure(figsize=(10, 5))
+    plt.hist(durations, bins=10, alpha=0.7)
+    plt.savefig(io.BytesIO(), format="png")
+
+
+def measure_case(case, reruns, rows, samples):
+    """Dans le processus courant : mémoire résidente au fil des réexécutions du cas `case`."""
+    sys.path.insert(0, REPO_ROOT)
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    import charts
+    from benchmarks.run import rss_mb
+
+    burned, consumed, rolling_net, durations = page_data(rows)
+    if case == "pyplot":
+        def rerun():
+            legacy_rerun(burned, consumed, rolling_net, durations)
+    else:
+        if case == "cache":
+            from views.visualisations import calories_chart, durations_histogram
+        else:
+            calories_chart, durations_histogram = charts.calories_chart, charts.durations_histogram
+
+        def rerun():
+            calories_chart(burned, consumed, rolling_net)
+            durations_histogram(durations)
+
+    rerun()  # Imports et premiers rendus hors mesure
+    start_rss = rss_mb()
+    trace = []
+    start = time.perf_counter()
+    for i in range(1, reruns + 1):
+        rerun()
+        if i % max(1, reruns // samples) == 0 or i == reruns:
+            trace.append((i, round(rss_mb() - start_rss, 1)))
+    elapsed = time.perf_counter() - start
+    return {
+        "case": case,
+        "reruns": reruns,
+        "points": len(burned),
+        "ms_per_rerun": round(elapsed / reruns * 1000, 2),
+        "start_rss_mb": round(start_rss, 1),
+        "growth_mb": trace[-1][1],
+        # Croissance sur la seconde moitié : une fuite continue, le rodage de l'allocateur non
+        "second_half_growth_mb": round(trace[-1][1] - next(g for i, g in trace if i >= reruns // 2), 1),
+        "open_figures": len(plt.get_fignums()),
+        "trace": trace,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reruns", type=int, default=1000, help="Réexécutions simulées par cas")
+    parser.add_argument("--legacy-reruns", type=int, default=60,
+                        help="Réexécutions de l'ancien code pyplot (plusieurs Mo perdus par réexécution)")
+    parser.add_argument("--rows", type=int, default=365, help="Taille de l'historique (un repas et un entraînement par jour)")
+    parser.add_argument("--cases", nargs="+", default=CASES, choices=CASES)
+    parser.add_argument("--samples", type=int, default=10, help="Relevés de mémoire par cas")
+    parser.add_argument("--output", default=None, help="Fichier JSON des résultats (facultatif)")
+    parser.add_argument("--child", default=None, help=argparse.SUPPRESS)  # Mesure d'un cas dans ce processus
+    args = parser.parse_args(argv)
+
+    if args.child is not None:
+        reruns = args.legacy_reruns if args.child == "pyplot" else args.reruns
+        print(json.dumps(measure_case(args.child, reruns, args.rows, args.samples)))
+        return
+
+    results = []
+    for case in args.cases:
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.chart_memory", "--child", case, "--reruns", str(args.reruns),
+             "--legacy-reruns", str(args.legacy_reruns), "--rows", str(args.rows), "--samples", str(args.samples)],
+            env={**os.environ, "PYTHONPATH": REPO_ROOT}, capture_output=True, text=True, check=True,
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        results.append(result)
+        print(
+            f"{case:<7} {result['reruns']:>5} réexécutions  {result['ms_per_rerun']:>7.1f} ms chacune  "
+            f"{result['growth_mb']:+.1f} Mo (seconde moitié {result['second_half_growth_mb']:+.1f} Mo)  "
+            f"figures ouvertes {result['open_figures']}",
+            file=sys.stderr,
+        )
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"args": vars(args), "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Compare deux résultats du banc d'essai et signale les régressions.
+
+    python -m benchmarks.compare avant.json apres.json --threshold 0.1
+
+Code de sortie 1 si une mesure se dégrade de plus du seuil.
+"""
+import argparse
+import json
+import sys
+
+# Mesures comparées : plus petit est meilleur
+METRICS = ["cold_ms", "warm_ms_median", "cold_queries", "warm_queries", "cold_bytes", "warm_api_calls", "rss_mb"]
+# Différences de latence en dessous desquelles on ne conclut pas (bruit de mesure, en ms)
+MIN_MS_DELTA = 5
+
+
+def load(path):
+    with open(path) as f:
+        report = json.load(f)
+    return report["meta"], {(r["rows"], r["page"]): r for r in report["results"]}
+
+
+def compare(baseline, current, threshold=0.1):
+    """Renvoie les lignes du rapport et les régressions (taille, page, mesure, avant, après)."""
+    lines, regressions = [], []
+    for key in sorted(baseline.keys() & current.keys()):
+        before, after = baseline[key], current[key]
+        for metric in METRICS:
+            old, new = before.get(metric), after.get(metric)
+            if old is None or new is None:
+                continue
+            ratio = new / old if old else (1.0 if not new else float("inf"))
+            regressed = ratio > 1 + threshold and (not metric.endswith("ms") or new - old > MIN_MS_DELTA)
+            lines.append(f"{key[0]:>7} {key[1]:<28} {metric:<15} {old:>12.1f} -> {new:>12.1f}  x{ratio:.2f}"
+                         + ("  RÉGRESSION" if regressed else ""))
+            if regressed:
+                regressions.append((*key, metric, old, new))
+    return lines, regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Dégradation relative tolérée")
+    args = parser.parse_args(argv)
+
+    baseline_meta, baseline = load(args.baseline)
+    current_meta, current = load(args.current)
+    print(f"Avant : {baseline_meta.get('commit')}  Après : {current_meta.get('commit')}")
+    lines, regressions = compare(baseline, current, args.threshold)
+    print("\n".join(lines))
+    print(f"{len(regressions)} régression(s) au-delà de {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
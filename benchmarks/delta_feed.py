@@ -0,0 +1,94 @@
+"""Vérification reproductible des chargements incrémentaux contre la base Supabase en mémoire.
+
+Une session garde l'historique des entraînements en cache ; une autre session ajoute puis
+modifie des lignes (flux de changements). Contrôle que la lecture suivante ne transfère que
+les lignes modifiées, que les valeurs fusionnées sont à jour et que les pages en cache sont
+invalidées. Code de sortie 1 si un contrôle échoue.
+
+    python -m benchmarks.delta_feed --rows 10000
+"""
+import argparse
+import os
+import sys
+from datetime import date
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from benchmarks.fakes import FakeSupabase, seed_user  # noqa: E402
+from frames import TRAINING_TYPE_DTYPE  # noqa: E402
+from repository import UserDataRepository  # noqa: E402
+
+USER_ID = "bench-user"
+
+
+def read(db, repository):
+    """Lit l'historique ; renvoie le DataFrame et les octets reçus."""
+    before = db.counters()["bytes"]
+    frame = repository.get_trainings_frame(USER_ID)
+    return frame, db.counters()["bytes"] - before
+
+
+def run(rows):
+    db = FakeSupabase()
+    seed_user(db, USER_ID, rows)
+    session = UserDataRepository(db.session_client())
+    other = UserDataRepository(db.session_client())  # Autre onglet ou autre session : cache distinct
+
+    checks = []
+    frame, full_bytes = read(db, session)
+    checks.append(("premier chargement", len(frame) == rows, f"{len(frame)} lignes, {full_bytes} octets"))
+    _, page_total = session.get_trainings_page(USER_ID)
+
+    frame, idle_bytes = read(db, session)
+    checks.append((
+        "relecture sans changement", idle_bytes <= 2 and len(frame) == rows,
+        f"{idle_bytes} octets (réponse vide attendue)",
+    ))
+
+    # Flux de changements : une insertion et une modification faites par l'autre session
+    inserted = other.add_training(USER_ID, "Natation", date.today(), 45, 512).data[0]
+    edited_id = int(frame["id"].iloc[0])
+    other.client.table("trainings").update({"calories_burned": 4242}).eq("id", edited_id).execute()
+
+    frame, delta_bytes = read(db, session)
+    by_id = frame.set_index("id")
+    checks.append((
+        "transfert réduit aux lignes modifiées", delta_bytes < full_bytes / 10,
+        f"{delta_bytes} octets contre {full_bytes} pour un rechargement complet",
+    ))
+    checks.append((
+        "valeurs fusionnées",
+        len(frame) == rows + 1 and frame["id"].is_unique
+        and by_id.loc[edited_id, "calories_burned"] == 4242
+        and by_id.loc[inserted["id"], "training_type"] == "Natation"
+        and frame["training_type"].dtype == TRAINING_TYPE_DTYPE,
+        f"{len(frame)} lignes, ligne {edited_id} à {by_id.loc[edited_id, 'calories_burned']} kcal, "
+        f"nouvelle ligne {inserted['id']} présente : {inserted['id'] in by_id.index}",
+    ))
+    _, page_total_after = session.get_trainings_page(USER_ID)
+    checks.append((
+        "pages en cache invalidées", page_total_after == page_total + 1,
+        f"total de la page {page_total} puis {page_total_after}",
+    ))
+    stats = session.cache.stats()
+    checks.append((
+        "compteurs du cache", stats["deltas"] == 2 and stats["misses"] >= 1,
+        f"{stats['misses']} misses, {stats['deltas']} chargements partiels, {stats['hits']} hits",
+    ))
+    return checks
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10000, help="Taille de l'historique en cache")
+    args = parser.parse_args(argv)
+
+    checks = run(args.rows)
+    for name, ok, detail in checks:
+        print(f"{'OK   ' if ok else 'ÉCHEC'} {name:<38} {detail}")
+    return 0 if all(ok for _, ok, _ in checks) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
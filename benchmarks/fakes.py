@@ -0,0 +1,393 @@
+"""Doublures locales de Supabase et de Spoonacular pour les bancs d'essai."""
+import json
+import random
+import socket
+import threading
+import time
+from datetime import date, datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from repository import TRAINING_TYPES
+
+MEAL_NAMES = ["Salade", "Pâtes", "Poulet riz", "Omelette", "Soupe", "Sandwich", "Yaourt", "Pizza"]
+
+
+class FakeResponse:
+    def __init__(self, data, count=None):
+        self.data = data
+        self.count = count
+
+
+class FakeQuery:
+    """Sous-ensemble de l'API postgrest utilisé par l'application (select, filtres, tri, plage, écritures)."""
+
+    def __init__(self, db, table):
+        self.db = db
+        self.table = table
+        self.columns = None
+        self.count = None
+        self.filters = []
+        self.orders = []
+        self.window = None
+        self.operation = "select"
+        self.payload = None
+        self.on_conflict = None
+
+    def select(self, columns="*", count=None):
+        self.columns, self.count = columns, count
+        return self
+
+    def _filter(self, column, test):
+        self.filters.append((column, test))
+        return self
+
+    def eq(self, column, value):
+        return self._filter(column, lambda v: v == value)
+
+    def gt(self, column, value):
+        return self._filter(column, lambda v: v is not None and _comparable(v, value) > value)
+
+    def gte(self, column, value):
+        return self._filter(column, lambda v: v is not None and _comparable(v, value) >= value)
+
+    def lt(self, column, value):
+        return self._filter(column, lambda v: v is not None and _comparable(v, value) < value)
+
+    def in_(self, column, values):
+        values = set(values)
+        return self._filter(column, lambda v: v in values)
+
+    def order(self, column, desc=False):
+        self.orders.append((column, desc))
+        return self
+
+    def range(self, start, end):
+        self.window = (start, end + 1)
+        return self
+
+    def limit(self, size):
+        self.window = (0, size)
+        return self
+
+    def insert(self, payload):
+        self.operation, self.payload = "insert", payload
+        return self
+
+    def update(self, payload):
+        self.operation, self.payload = "update", payload
+        return self
+
+    def upsert(self, payload, on_conflict=None, ignore_duplicates=False):
+        self.operation, self.payload, self.on_conflict = "upsert", payload, on_conflict
+        return self
+
+    def execute(self):
+        return self.db.execute(self)
+
+
+def _comparable(value, other):
+    # Dates et horodatages circulent en chaînes ISO, comparables dans l'ordre lexicographique
+    return str(value) if isinstance(other, str) else value
+
+
+class FakeStorageBucket:
+    def __init__(self, db, bucket):
+        self.db = db
+        self.bucket = bucket
+
+    def upload(self, path, file, file_options=None):
+        time.sleep(self.db.latency)
+        with self.db.lock:
+            self.db.calls += 1
+            self.db.uploads[f"{self.bucket}/{path}"] = len(file)
+        return FakeResponse({"Key": path})
+
+
+class FakeStorage:
+    def __init__(self, db):
+        self.db = db
+
+    def from_(self, bucket):
+        return FakeStorageBucket(self.db, bucket)
+
+
+class FakeSupabase:
+    """Base en mémoire partagée par toutes les sessions ; compte requêtes, octets et temps passé.
+
+    Les réponses passent par un aller-retour JSON, comme sur le réseau. Chaque requête (table,
+    fonction ou Storage) attend en plus `latency` secondes, hors verrou, comme un aller-retour réseau.
+    """
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.tables = {"meals": [], "trainings": [], "meal_photos": []}
+        self.uploads = {}
+        self.lock = threading.Lock()
+        self.calls = 0
+        self.bytes = 0
+        self.seconds = 0.0
+        self._next_id = 0
+
+    def next_id(self):
+        self._next_id += 1
+        return self._next_id
+
+    def session_client(self, url=None, key=None, http_client=None, access_token=None):
+        """Remplace `supabase_client.SessionClient` : même signature, même base pour toutes les sessions."""
+        return FakeSessionClient(self, access_token)
+
+    def counters(self):
+        with self.lock:
+            return {"queries": self.calls, "bytes": self.bytes, "backend_seconds": self.seconds}
+
+    def execute(self, query):
+        time.sleep(self.latency)
+        start = time.perf_counter()
+        with self.lock:
+            if query.operation == "select":
+                data, count = self._select(query)
+            else:
+                data, count = self._write(query), None
+            self.calls += 1
+            body = json.dumps(data)
+            self.bytes += len(body)
+            self.seconds += time.perf_counter() - start
+        return FakeResponse(json.loads(body), count)
+
+    def _select(self, query):
+        rows = self.tables.setdefault(query.table, [])
+        for column, test in query.filters:
+            rows = [row for row in rows if test(row.get(column))]
+        for column, desc in reversed(query.orders):
+            rows = sorted(rows, key=lambda row: row.get(column), reverse=desc)
+        count = len(rows) if query.count else None
+        if query.window:
+            rows = rows[query.window[0]:query.window[1]]
+        if query.columns and query.columns != "*":
+            columns = [c.strip() for c in query.columns.split(",")]
+            rows = [{c: row.get(c) for c in columns} for row in rows]
+        return rows, count
+
+    def _write(self, query):
+        rows = self.tables.setdefault(query.table, [])
+        if query.operation == "update":
+            # Lignes filtrées modifiées ; updated_at avancé comme par le trigger de la migration
+            matched = [row for row in rows if all(test(row.get(column)) for column, test in query.filters)]
+            for row in matched:
+                row.update(query.payload, updated_at=_now())
+            return matched
+        payload = query.payload if isinstance(query.payload, list) else [query.payload]
+        conflict_columns = query.on_conflict.split(",") if query.on_conflict else []
+        existing = {tuple(row.get(c) for c in conflict_columns) for row in rows} if conflict_columns else set()
+        inserted = []
+        for values in payload:
+            if conflict_columns and tuple(values.get(c) for c in conflict_columns) in existing:
+                continue
+            row = {"date": date.today().isoformat(), **values, "id": self.next_id(), "updated_at": _now()}
+            rows.append(row)
+            inserted.append(row)
+        return inserted
+
+    def rpc(self, name, params):
+        if name != "calorie_totals":
+            raise ValueError(f"Fonction inconnue : {name}")
+        return _FakeRpc(self, params)
+
+
+class _FakeRpc:
+    def __init__(self, db, params):
+        self.db = db
+        self.params = params
+
+    def execute(self):
+        time.sleep(self.db.latency)
+        start = time.perf_counter()
+        user_id, since = self.params["p_user_id"], self.params["p_since"]
+        with self.db.lock:
+            trainings = [r for r in self.db.tables["trainings"] if r["user_id"] == user_id and r["date"] >= since]
+            meals = [r for r in self.db.tables["meals"] if r["user_id"] == user_id and r["date"] >= since]
+            data = [{
+                "calories_burned": sum(r["calories_burned"] for r in trainings),
+                "calories_consumed": sum(r["calories"] for r in meals),
+                "training_count": len(trainings),
+                "meal_count": len(meals),
+            }]
+            self.db.calls += 1
+            self.db.bytes += len(json.dumps(data))
+            self.db.seconds += time.perf_counter() - start
+        return FakeResponse(data)
+
+
+class FakeSessionClient:
+    """Vue de session sur la base en mémoire (même interface que supabase_client.SessionClient)."""
+
+    def __init__(self, db, access_token=None):
+        self.db = db
+        self.access_token = access_token
+        self.storage = FakeStorage(db)
+
+    def table(self, table_name):
+        return FakeQuery(self.db, table_name)
+
+    def rpc(self, fn, params=None):
+        return self.db.rpc(fn, params or {})
+
+
+def _now():
+    return datetime.now(timezone.utc).isoformat()
+
+
+def seed_user(db, user_id, rows, days=730, seed=0):
+    """Ajoute `rows` repas et `rows` entraînements répartis sur `days` jours, et une photo pour un repas sur cinq."""
+    rng = random.Random(seed)
+    today = date.today()
+    updated_at = (datetime.now(timezone.utc) - timedelta(days=1)).isoformat()  # Historique déjà ancien
+    for i in range(rows):
+        day = (today - timedelta(days=rng.randrange(days) if i >= 10 else i)).isoformat()
+        db.tables["trainings"].append({
+            "id": db.next_id(), "user_id": user_id, "date": day, "updated_at": updated_at,
+            "training_type": rng.choice(TRAINING_TYPES), "duration": rng.randint(10, 120),
+            "calories_burned": rng.randint(100, 900),
+        })
+        meal_id = db.next_id()
+        db.tables["meals"].append({
+            "id": meal_id, "user_id": user_id, "date": day, "updated_at": updated_at,
+            "name": rng.choice(MEAL_NAMES), "calories": rng.randint(200, 1200),
+            "proteins": round(rng.uniform(5, 60), 1), "carbs": round(rng.uniform(10, 120), 1),
+            "fats": round(rng.uniform(2, 50), 1),
+        })
+        if i % 5 == 0:
+            db.tables["meal_photos"].append({
+                "id": db.next_id(), "meal_id": meal_id,
+                "photo_url": f"https://example.invalid/photos/{meal_id}.webp",
+                "thumbnail_url": f"https://example.invalid/photos/{meal_id}_thumb.webp",
+            })
+
+
+class FakeSpoonacular:
+    """Serveur HTTP local imitant findByNutrients ; compte les appels reçus.
+
+    Chaque réponse attend `latency` secondes, plus un supplément tiré entre 0 et `jitter` ; une
+    proportion `failure_rate` des requêtes reçoit une erreur 503.
+    """
+
+    def __init__(self, latency=0.0, recipes=3, jitter=0.0, failure_rate=0.0, seed=0):
+        self.latency = latency
+        self.recipes = recipes
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.calls = 0
+        self.failures = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self._server.server_port}/recipes/findByNutrients"
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def recipe(self, params, i):
+        """Recette synthétique au centre de la fenêtre demandée (format de réponse de findByNutrients)."""
+        def middle(nutrient):
+            return (params.get(f"min{nutrient}", 0) + params.get(f"max{nutrient}", 0)) // 2
+
+        calories = middle("Calories")
+        return {
+            "id": hash((calories, middle("Protein"), middle("Carbs"), middle("Fat"), i)) & 0x7FFFFFFF,
+            "title": f"Recette {calories} kcal #{i}",
+            "image": f"https://example.invalid/recipes/{calories}_{i}.jpg",
+            "calories": calories + i,
+            "protein": f"{middle('Protein')}g",
+            "carbs": f"{middle('Carbs')}g",
+            "fat": f"{middle('Fat')}g",
+        }
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                # Sans TCP_NODELAY, l'ACK retardé ajoute ~40 ms par requête keep-alive
+                self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+            def do_GET(self):
+                with fake._lock:
+                    fake.calls += 1
+                    delay = fake.latency + fake._rng.uniform(0, fake.jitter)
+                    failed = fake._rng.random() < fake.failure_rate
+                    fake.failures += failed
+                time.sleep(delay)
+                if failed:
+                    body = b'{"status": "failure", "message": "Service unavailable"}'
+                    self.send_response(503)
+                else:
+                    params = {k: int(v[0]) for k, v in parse_qs(urlsplit(self.path).query).items() if v[0].isdigit()}
+                    body = json.dumps([fake.recipe(params, i) for i in range(fake.recipes)]).encode()
+                    self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+class FakePostgrest:
+    """Serveur HTTP local imitant PostgREST pour les tests de charge ; compte requêtes et connexions."""
+
+    def __init__(self, latency=0.005, rows=1):
+        self.latency = latency
+        self.body = json.dumps([{"id": i} for i in range(rows)]).encode()
+        self.requests = 0
+        self.connections = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self._server.server_port}"
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                with fake._lock:
+                    fake.connections += 1
+
+            def do_GET(self):
+                with fake._lock:
+                    fake.requests += 1
+                time.sleep(fake.latency)
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(fake.body)))
+                self.end_headers()
+                self.wfile.write(fake.body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
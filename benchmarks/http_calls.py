@@ -0,0 +1,121 @@
+"""Banc d'essai des appels à Spoonacular : requêtes isolées ou session partagée, recherches en série ou en parallèle.
+
+Contre le faux serveur local (latence variable, une part de réponses 503), mesure p50/p99 et
+taux d'échec d'un appel isolé `requests.get`, du même appel par `HttpClient` (pool de
+connexions et nouvelles tentatives), puis de plusieurs profils cherchés un à un
+(`find_by_nutrients`) ou ensemble (`find_many`).
+
+    python -m benchmarks.http_calls --calls 200 --profiles 4 --output http.json
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+import requests
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from benchmarks.fakes import FakeSpoonacular  # noqa: E402
+from http_client import HttpClient  # noqa: E402
+from recipe_index import RecipeIndex  # noqa: E402
+from spoonacular import RecipeCache, SpoonacularClient, nutrient_params  # noqa: E402
+
+
+def summarize(name, durations, failures=0):
+    durations = sorted(durations)
+    return {
+        "case": name,
+        "runs": len(durations),
+        "ms_p50": round(statistics.median(durations) * 1000, 2),
+        "ms_p99": round(float(np.percentile(durations, 99)) * 1000, 2),
+        "failure_rate": round(failures / len(durations), 3),
+    }
+
+
+def single_calls(server, get, calls, rng):
+    """`calls` requêtes findByNutrients sur des profils tirés au hasard ; renvoie durées et échecs."""
+    durations, failures = [], 0
+    for _ in range(calls):
+        params = nutrient_params(rng.uniform(200, 1400), rng.uniform(10, 70), rng.uniform(10, 140), rng.uniform(5, 60))
+        start = time.perf_counter()
+        try:
+            failures += get(server.url, params).status_code != 200
+        except requests.RequestException:
+            failures += 1
+        durations.append(time.perf_counter() - start)
+    return durations, failures
+
+
+def profile_lookups(server, http, runs, profiles, rng, workdir, batched):
+    """`runs` recherches de `profiles` profils, sans cache ni catalogue préalables ; renvoie durées et échecs."""
+    durations, failures = [], 0
+    for run in range(runs):
+        client = SpoonacularClient(
+            "bench", cache=RecipeCache(os.path.join(workdir, f"{batched}-{run}.sqlite3")),
+            url=server.url, http=http, index=RecipeIndex(),
+        )
+        # Profils éloignés d'au moins une fenêtre : aucun ne profite de la réponse d'un autre
+        wanted = [(300 + 250 * i + rng.uniform(0, 100), 30, 50, 20) for i in range(profiles)]
+        start = time.perf_counter()
+        try:
+            if batched:
+                client.find_many(wanted)
+            else:
+                for profile in wanted:
+                    client.find_by_nutrients(*profile)
+        except Exception:
+            failures += 1
+        durations.append(time.perf_counter() - start)
+    return durations, failures
+
+
+def run(calls, profiles, latency, jitter, failure_rate, seed=0):
+    rng = np.random.default_rng(seed)
+    server = FakeSpoonacular(latency=latency, jitter=jitter, failure_rate=failure_rate, seed=seed)
+    http = HttpClient(max_workers=profiles)
+    results = []
+    try:
+        with tempfile.TemporaryDirectory() as workdir:
+            bare = single_calls(server, lambda url, params: requests.get(url, params=params, timeout=10), calls, rng)
+            results.append(summarize("requests.get isolé", *bare))
+            pooled = single_calls(server, http.get, calls, rng)
+            results.append(summarize("HttpClient (pool, tentatives)", *pooled))
+            runs = max(1, calls // profiles)
+            sequential = profile_lookups(server, http, runs, profiles, rng, workdir, batched=False)
+            results.append(summarize(f"{profiles} profils en série", *sequential))
+            concurrent = profile_lookups(server, http, runs, profiles, rng, workdir, batched=True)
+            results.append(summarize(f"{profiles} profils avec find_many", *concurrent))
+    finally:
+        server.close()
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=200, help="Appels mesurés par cas")
+    parser.add_argument("--profiles", type=int, default=4, help="Profils de macronutriments par recherche groupée")
+    parser.add_argument("--latency", type=float, default=0.005, help="Latence minimale du serveur (s)")
+    parser.add_argument("--jitter", type=float, default=0.025, help="Supplément de latence aléatoire maximal (s)")
+    parser.add_argument("--failure-rate", type=float, default=0.1, help="Proportion de réponses 503")
+    parser.add_argument("--output", default=None, help="Fichier JSON des résultats (facultatif)")
+    args = parser.parse_args(argv)
+
+    results = run(args.calls, args.profiles, args.latency, args.jitter, args.failure_rate)
+    for result in results:
+        print(
+            f"{result['case']:<32} p50 {result['ms_p50']:>7.1f} ms  p99 {result['ms_p99']:>7.1f} ms  "
+            f"échecs {result['failure_rate']:.0%}"
+        )
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"args": vars(args), "results": results}, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Banc d'essai du modèle de prédiction des calories : latence d'une réexécution avec et sans ModelStore.
+
+Pour chaque taille d'historique d'entraînements, mesure ce que coûte le modèle à chaque
+réexécution de la page (par exemple à chaque mouvement du curseur de durée) :
+
+- sans store : ancien code (`train_test_split` + `LinearRegression`) et `CalorieModel` réajusté ;
+- avec store : modèle en mémoire, relu depuis le disque, ou mis à jour après un nouvel entraînement.
+
+    python -m benchmarks.model --trainings 10 1000 10000 100000 --output model.json
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import pandas as pd
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from benchmarks.fakes import FakeSupabase, seed_user  # noqa: E402
+from frames import trainings_frame  # noqa: E402
+from model_store import CalorieModel, ModelStore  # noqa: E402
+
+USER_ID = "bench-user"
+
+
+def refit_sklearn(trainings):
+    """Ancienne version de train_predictive_model : découpage, ajustement et score à chaque exécution."""
+    from sklearn.linear_model import LinearRegression
+    from sklearn.model_selection import train_test_split
+
+    df = pd.DataFrame(trainings)
+    X_train, X_test, y_train, y_test = train_test_split(
+        df[["duration"]], df["calories_burned"], test_size=0.2, random_state=42
+    )
+    model = LinearRegression().fit(X_train, y_train)
+    model.score(X_test, y_test)
+
+
+def refit(trainings):
+    """Même modèle que le store, réajusté sur tout l'historique."""
+    model = CalorieModel()
+    model.add_many(trainings)
+    model.score()
+
+
+def timings(func, reruns, setup=None):
+    """Durées (ms) de `reruns` appels à `func`, précédés d'un appel `setup` hors mesure."""
+    durations = []
+    for _ in range(reruns):
+        args = setup() if setup else ()
+        start = time.perf_counter()
+        func(*args)
+        durations.append((time.perf_counter() - start) * 1000)
+    return durations
+
+
+def run(count, reruns):
+    db = FakeSupabase()
+    seed_user(db, USER_ID, count)
+    rows = db.tables["trainings"]
+    trainings = trainings_frame(rows)
+    new_row = {**rows[-1], "id": db.next_id(), "updated_at": datetime.now(timezone.utc).isoformat()}
+    appended = trainings_frame([*rows, new_row])
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        store = ModelStore(cache_dir=cache_dir)
+        store.get_model(USER_ID, trainings).score()
+
+        def from_disk():
+            return (ModelStore(cache_dir=cache_dir),)
+
+        def incremental():
+            fresh = ModelStore(cache_dir=os.path.join(cache_dir, "incremental"))
+            fresh.get_model(USER_ID, trainings)
+            return (fresh,)
+
+        cases = {
+            "sklearn_refit": timings(lambda: refit_sklearn(rows), reruns),
+            "refit": timings(lambda: refit(trainings), reruns),
+            "store_memory": timings(lambda: store.get_model(USER_ID, trainings).score(), reruns),
+            "store_disk": timings(lambda s: s.get_model(USER_ID, trainings).score(), reruns, from_disk),
+            "store_new_training": timings(lambda s: s.get_model(USER_ID, appended).score(), reruns, incremental),
+        }
+    return {"trainings": count, **{f"{case}_ms": round(statistics.median(d), 3) for case, d in cases.items()}}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--trainings", type=int, nargs="+", default=[10, 1000, 10000, 100000])
+    parser.add_argument("--reruns", type=int, default=20, help="Réexécutions mesurées par cas (médiane)")
+    parser.add_argument("--output", default=None, help="Fichier JSON des résultats (facultatif)")
+    args = parser.parse_args(argv)
+
+    import sklearn.linear_model  # noqa: F401  Import hors mesure
+
+    results = [run(count, args.reruns) for count in args.trainings]
+    for result in results:
+        print(
+            f"{result['trainings']:>7} entraînements  sans store : sklearn {result['sklearn_refit_ms']:>8.2f} ms, "
+            f"réajusté {result['refit_ms']:>8.2f} ms  avec store : mémoire {result['store_memory_ms']:>7.3f} ms, "
+            f"disque {result['store_disk_ms']:>7.3f} ms, nouvel entraînement {result['store_new_training_ms']:>7.3f} ms"
+        )
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"args": vars(args), "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Banc d'essai du chargement des photos de repas : une requête par repas ou requêtes groupées.
+
+Contre la base Supabase en mémoire, compte les allers-retours et le temps passé pour récupérer
+les photos de tous les repas d'un historique de 10 à 10 000 repas. Le temps estimé ajoute
+`--rtt` millisecondes par aller-retour, ordre de grandeur d'un appel PostgREST réel.
+
+    python -m benchmarks.photos --meals 10 1000 10000 --output photos.json
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from benchmarks.fakes import FakeSupabase, seed_user  # noqa: E402
+from repository import PHOTO_COLUMNS, UserDataRepository  # noqa: E402
+
+USER_ID = "bench-user"
+
+
+def photos_per_meal(client, meal_ids):
+    """Ancien chargement : une requête par repas."""
+    return {
+        meal_id: client.table("meal_photos").select(PHOTO_COLUMNS).eq("meal_id", meal_id).execute().data
+        for meal_id in meal_ids
+    }
+
+
+def measure(db, load, rtt_ms):
+    before = db.counters()
+    start = time.perf_counter()
+    photos = load()
+    elapsed = time.perf_counter() - start
+    queries = db.counters()["queries"] - before["queries"]
+    return {
+        "queries": queries,
+        "ms": round(elapsed * 1000, 2),
+        "estimated_ms": round(elapsed * 1000 + queries * rtt_ms, 2),
+        "photos": sum(len(rows) for rows in photos.values()),
+    }
+
+
+def run(meals, rtt_ms):
+    db = FakeSupabase()
+    seed_user(db, USER_ID, meals)
+    client = db.session_client()
+    meal_ids = [meal["id"] for meal in db.tables["meals"]]
+    repository = UserDataRepository(client)
+    return {
+        "meals": meals,
+        "per_meal": measure(db, lambda: photos_per_meal(client, meal_ids), rtt_ms),
+        "batched": measure(db, lambda: repository.get_meals_photos(USER_ID, meal_ids), rtt_ms),
+        "batched_cached": measure(db, lambda: repository.get_meals_photos(USER_ID, meal_ids), rtt_ms),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--meals", type=int, nargs="+", default=[10, 1000, 10000])
+    parser.add_argument("--rtt", type=float, default=20, help="Durée supposée d'un aller-retour Supabase (ms)")
+    parser.add_argument("--output", default=None, help="Fichier JSON des résultats (facultatif)")
+    args = parser.parse_args(argv)
+
+    results = [run(meals, args.rtt) for meals in args.meals]
+    for result in results:
+        for case in ("per_meal", "batched", "batched_cached"):
+            measured = result[case]
+            print(
+                f"{result['meals']:>6} repas  {case:<15} {measured['queries']:>6} requêtes  "
+                f"{measured['ms']:>9.1f} ms  estimé {measured['estimated_ms']:>10.1f} ms  "
+                f"{measured['photos']} photos"
+            )
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"args": vars(args), "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""Vérification reproductible du cache Spoonacular contre le faux serveur local.
+
+Contrôle, avec latences mesurées, le succès de cache (aucun appel à l'API), l'expiration (TTL),
+l'éviction des entrées les moins utilisées et le regroupement des demandes simultanées d'un
+même palier en un seul appel. Code de sortie 1 si un contrôle échoue.
+
+    python -m benchmarks.recipe_cache --sessions 8 --latency 0.2
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from benchmarks.fakes import FakeSpoonacular  # noqa: E402
+from http_client import HttpClient  # noqa: E402
+from recipe_index import RecipeIndex  # noqa: E402
+from spoonacular import RecipeCache, SpoonacularClient  # noqa: E402
+
+PROFILE = (520, 32, 61, 18)
+
+
+def new_client(server, cache, http):
+    """Client au catalogue local vide : chaque recherche passe par le cache SQLite."""
+    return SpoonacularClient("bench", cache=cache, url=server.url, http=http, index=RecipeIndex())
+
+
+def timed_lookup(client, profile=PROFILE):
+    start = time.perf_counter()
+    recipes = client.find_by_nutrients(*profile)
+    return recipes, (time.perf_counter() - start) * 1000
+
+
+def check_hit(server, http, workdir):
+    cache = RecipeCache(os.path.join(workdir, "hit.sqlite3"))
+    calls = server.calls
+    first, miss_ms = timed_lookup(new_client(server, cache, http))
+    # Besoins légèrement différents, même palier : même entrée de cache
+    second, hit_ms = timed_lookup(new_client(server, cache, http), (530, 31, 59, 19))
+    ok = server.calls - calls == 1 and first == second
+    return ok, f"appels API {server.calls - calls} (attendu 1), absent {miss_ms:.1f} ms, présent {hit_ms:.1f} ms"
+
+
+def check_ttl(server, http, workdir, ttl=0.3):
+    cache = RecipeCache(os.path.join(workdir, "ttl.sqlite3"), ttl=ttl)
+    calls = server.calls
+    timed_lookup(new_client(server, cache, http))
+    timed_lookup(new_client(server, cache, http))
+    time.sleep(ttl * 1.5)
+    _, expired_ms = timed_lookup(new_client(server, cache, http))
+    ok = server.calls - calls == 2
+    return ok, f"appels API {server.calls - calls} (attendu 2 : premier appel puis expiration), après expiration {expired_ms:.1f} ms"
+
+
+def check_eviction(workdir):
+    cache = RecipeCache(os.path.join(workdir, "lru.sqlite3"), max_entries=2)
+    keys = ["palier-300", "palier-400", "palier-500"]
+    cache.set(keys[0], ["a"])
+    time.sleep(0.01)
+    cache.set(keys[1], ["b"])
+    time.sleep(0.01)
+    cache.get(keys[0])  # La première entrée redevient la plus récemment utilisée
+    time.sleep(0.01)
+    cache.set(keys[2], ["c"])
+    kept = [cache.get(key) is not None for key in keys]
+    return kept == [True, False, True], f"entrées conservées {kept} (attendu [True, False, True])"
+
+
+def check_coalescing(server, http, workdir, sessions):
+    client = new_client(server, RecipeCache(os.path.join(workdir, "coalesce.sqlite3")), http)
+    barrier = threading.Barrier(sessions)
+    results, durations = [None] * sessions, [0.0] * sessions
+
+    def session(i):
+        barrier.wait()
+        results[i], durations[i] = timed_lookup(client)
+
+    calls = server.calls
+    threads = [threading.Thread(target=session, args=(i,)) for i in range(sessions)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stats = client.stats()
+    ok = server.calls - calls == 1 and stats["coalesced"] == sessions - 1 and all(r == results[0] for r in results)
+    return ok, (
+        f"{sessions} sessions simultanées : appels API {server.calls - calls} (attendu 1), "
+        f"regroupées {stats['coalesced']}, latence max {max(durations):.1f} ms"
+    )
+
+
+def run(sessions, latency):
+    server = FakeSpoonacular(latency=latency)
+    http = HttpClient(max_workers=sessions)
+    try:
+        with tempfile.TemporaryDirectory() as workdir:
+            return [
+                ("succès de cache", *check_hit(server, http, workdir)),
+                ("expiration (TTL)", *check_ttl(server, http, workdir)),
+                ("éviction LRU", *check_eviction(workdir)),
+                ("regroupement", *check_coalescing(server, http, workdir, sessions)),
+            ]
+    finally:
+        server.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=8, help="Sessions simultanées pour le regroupement")
+    parser.add_argument("--latency", type=float, default=0.2, help="Latence simulée de Spoonacular (s)")
+    args = parser.parse_args(argv)
+
+    checks = run(args.sessions, args.latency)
+    for name, ok, detail in checks:
+        print(f"{'OK   ' if ok else 'ÉCHEC'} {name:<18} {detail}")
+    return 0 if all(ok for _, ok, _ in checks) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
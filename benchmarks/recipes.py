@@ -0,0 +1,114 @@
+"""Banc d'essai du catalogue local de recettes : construction de l'index et latence des recherches.
+
+    python -m benchmarks.recipes --recipes 100000 --output recipes.json
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from recipe_index import NUTRIENTS, WINDOW, RecipeIndex  # noqa: E402
+
+
+def synthetic_recipes(count, seed=0):
+    """Recettes aux macronutriments répartis comme des plats courants (100 à 1500 kcal)."""
+    rng = np.random.default_rng(seed)
+    values = np.column_stack([
+        rng.uniform(100, 1500, count),
+        rng.uniform(0, 80, count),
+        rng.uniform(0, 150, count),
+        rng.uniform(0, 70, count),
+    ]).round(0)
+    return [
+        {"id": i, "title": f"Recette {i}", "image": "", "calories": int(c), "protein": f"{p:.0f}g",
+         "carbs": f"{g:.0f}g", "fat": f"{f:.0f}g"}
+        for i, (c, p, g, f) in enumerate(values)
+    ]
+
+
+def percentile(values, q):
+    return float(np.percentile(values, q))
+
+
+def run(count, queries, k=3, seed=0):
+    recipes = synthetic_recipes(count, seed)
+    rng = np.random.default_rng(seed + 1)
+    profiles = np.column_stack([
+        rng.uniform(200, 1400, queries), rng.uniform(10, 70, queries),
+        rng.uniform(10, 140, queries), rng.uniform(5, 60, queries),
+    ])
+
+    index = RecipeIndex()
+    start = time.perf_counter()
+    index.add(recipes)
+    add_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    index.query(*profiles[0], k=k)  # Construit l'arbre
+    build_ms = (time.perf_counter() - start) * 1000
+
+    single = []
+    found = 0
+    for profile in profiles:
+        start = time.perf_counter()
+        found += len(index.query(*profile, k=k)) == k
+        single.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    index.query_many(profiles.tolist(), k=k)
+    batch_ms = (time.perf_counter() - start) * 1000
+
+    # Référence : parcours linéaire de toute la matrice pour chaque recherche
+    matrix = np.array([[float(str(r[n]).rstrip("g")) for n in NUTRIENTS] for r in recipes]) / WINDOW
+    linear = []
+    for profile in profiles[:min(queries, 200)]:
+        start = time.perf_counter()
+        distances = np.abs(matrix - profile / WINDOW).max(axis=1)
+        np.argpartition(distances, k)[:k]
+        linear.append((time.perf_counter() - start) * 1000)
+
+    return {
+        "recipes": count,
+        "queries": queries,
+        "k": k,
+        "add_ms": round(add_ms, 2),
+        "build_ms": round(build_ms, 2),
+        "query_ms_p50": round(statistics.median(single), 4),
+        "query_ms_p99": round(percentile(single, 99), 4),
+        "batch_ms_per_query": round(batch_ms / queries, 4),
+        "linear_scan_ms_p50": round(statistics.median(linear), 4),
+        "local_hit_rate": round(found / queries, 3),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--recipes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--k", type=int, default=3)
+    parser.add_argument("--output", default=None, help="Fichier JSON des résultats (facultatif)")
+    args = parser.parse_args(argv)
+
+    import sklearn.neighbors  # noqa: F401  Import hors mesure
+
+    results = [run(count, args.queries, args.k) for count in args.recipes]
+    for result in results:
+        print(
+            f"{result['recipes']:>7} recettes  ajout {result['add_ms']:>7.1f} ms  arbre {result['build_ms']:>6.1f} ms  "
+            f"recherche p50 {result['query_ms_p50']:.3f} ms  p99 {result['query_ms_p99']:.3f} ms  "
+            f"par lot {result['batch_ms_per_query']:.4f} ms  parcours linéaire {result['linear_scan_ms_p50']:.3f} ms  "
+            f"trouvées {result['local_hit_rate']:.0%}"
+        )
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"args": vars(args), "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""Banc d'essai : exécute les pages de l'application sans navigateur (AppTest) contre des doublures locales.
+
+Pour chaque taille d'historique et chaque page, mesure la première exécution (caches vides,
+modules déjà importés) puis des réexécutions : latence, requêtes Supabase, octets, appels
+Spoonacular et mémoire résidente du processus après la page.
+
+    python -m benchmarks.run --rows 10 1000 100000 --output bench.json
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import streamlit as st  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+import supabase_client  # noqa: E402
+from benchmarks.fakes import FakeSpoonacular, FakeSupabase, seed_user  # noqa: E402
+
+DEFAULT_PAGES = ["Voir les repas", "Voir les entraînements", "Suggestions personnalisées", "Visualisations avancées"]
+USER = {"id": "bench-user", "email": "bench@example.invalid"}
+
+
+def rss_mb():
+    """Mémoire résidente actuelle du processus (Mo), ou le pic si /proc n'est pas disponible."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], cwd=REPO_ROOT, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+@contextmanager
+def isolated_cwd():
+    """Répertoire de travail vide : les caches sur disque (modèles, recettes) ne passent pas d'une mesure à l'autre."""
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        try:
+            yield
+        finally:
+            os.chdir(cwd)
+
+
+def _measure(at, db, spoonacular):
+    """Exécute le script une fois ; renvoie durée, requêtes, octets, temps passé dans la doublure, appels API."""
+    before, api_before = db.counters(), spoonacular.calls
+    start = time.perf_counter()
+    at.run()
+    elapsed = time.perf_counter() - start
+    after = db.counters()
+    errors = [e.value for e in at.exception] + [e.value for e in at.error]
+    return {
+        "ms": elapsed * 1000,
+        "queries": after["queries"] - before["queries"],
+        "bytes": after["bytes"] - before["bytes"],
+        "backend_ms": (after["backend_seconds"] - before["backend_seconds"]) * 1000,
+        "api_calls": spoonacular.calls - api_before,
+        "errors": [str(e)[:200] for e in errors],
+    }
+
+
+def bench_page(page, rows, db, spoonacular, reruns, timeout):
+    """Mesure une page : première exécution avec caches vides, puis `reruns` réexécutions."""
+    st.cache_resource.clear()
+    st.cache_data.clear()
+
+    at = AppTest.from_file(os.path.join(REPO_ROOT, "main.py"), default_timeout=timeout)
+    at.secrets["SUPABASE_URL"] = "http://supabase.invalid"
+    at.secrets["SUPABASE_KEY"] = "bench"
+    at.secrets["SPOONACULAR_API_KEY"] = "bench"
+    at.secrets["SPOONACULAR_URL"] = spoonacular.url
+    at.session_state["user"] = dict(USER)
+    at.run()  # Chargement du script sur la page par défaut, hors mesure
+    at.sidebar.selectbox[0].set_value(page)
+
+    cold = _measure(at, db, spoonacular)
+    warm = [_measure(at, db, spoonacular) for _ in range(reruns)]
+    warm_ms = sorted(run["ms"] for run in warm)
+    return {
+        "rows": rows,
+        "page": page,
+        "cold_ms": round(cold["ms"], 2),
+        "cold_queries": cold["queries"],
+        "cold_bytes": cold["bytes"],
+        "cold_backend_ms": round(cold["backend_ms"], 2),
+        "cold_api_calls": cold["api_calls"],
+        "warm_ms_median": round(statistics.median(warm_ms), 2) if warm else None,
+        "warm_ms_max": round(warm_ms[-1], 2) if warm else None,
+        "warm_queries": sum(run["queries"] for run in warm) / len(warm) if warm else None,
+        "warm_bytes": sum(run["bytes"] for run in warm) / len(warm) if warm else None,
+        "warm_api_calls": sum(run["api_calls"] for run in warm),
+        "rss_mb": round(rss_mb(), 1),
+        "errors": sorted({e for run in [cold, *warm] for e in run["errors"]}),
+    }
+
+
+def run(sizes, pages, reruns=5, api_latency=0.05, timeout=300):
+    """Exécute le banc d'essai ; renvoie les résultats (un dict par taille et par page)."""
+    results = []
+    session_client = supabase_client.SessionClient
+    spoonacular = FakeSpoonacular(latency=api_latency)
+    try:
+        # Passage préalable sur un petit historique : les imports de modules ne comptent pas dans les mesures
+        warmup = FakeSupabase()
+        seed_user(warmup, USER["id"], 10)
+        supabase_client.SessionClient = warmup.session_client
+        for page in pages:
+            with isolated_cwd():
+                bench_page(page, 10, warmup, spoonacular, 0, timeout)
+
+        for rows in sizes:
+            db = FakeSupabase()
+            seed_user(db, USER["id"], rows)
+            supabase_client.SessionClient = db.session_client
+            for page in pages:
+                with isolated_cwd():
+                    result = bench_page(page, rows, db, spoonacular, reruns, timeout)
+                results.append(result)
+                print(
+                    f"{rows:>7} lignes  {page:<28} première {result['cold_ms']:>9.1f} ms "
+                    f"({result['cold_queries']} requêtes, {result['cold_api_calls']} appels API)  "
+                    f"suivantes {result['warm_ms_median'] or 0:>8.1f} ms  {result['rss_mb']:.0f} Mo",
+                    file=sys.stderr,
+                )
+    finally:
+        supabase_client.SessionClient = session_client
+        spoonacular.close()
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10, 1000, 10000, 100000],
+                        help="Tailles d'historique (repas et entraînements) de l'utilisateur de test")
+    parser.add_argument("--pages", nargs="+", default=DEFAULT_PAGES, help="Pages du menu à mesurer")
+    parser.add_argument("--reruns", type=int, default=5, help="Réexécutions mesurées après la première")
+    parser.add_argument("--api-latency", type=float, default=0.05, help="Latence simulée de Spoonacular (s)")
+    parser.add_argument("--timeout", type=float, default=300, help="Délai maximal d'une exécution (s)")
+    parser.add_argument("--output", default="bench.json", help="Fichier JSON des résultats")
+    args = parser.parse_args(argv)
+
+    output = os.path.abspath(args.output)
+    results = run(args.rows, args.pages, args.reruns, args.api_latency, args.timeout)
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "date": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "args": vars(args),
+        },
+        "results": results,
+    }
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"Résultats écrits dans {output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Test de charge des connexions Supabase : sessions simultanées contre un serveur PostgREST local.
+
+Chaque réexécution simulée prépare un client puis envoie un select. Compare l'ancien code
+(`create_client` à chaque réexécution, connexions propres) aux vues `SessionClient` sur le
+transport httpx partagé par le processus : latence p50/p99, débit et connexions ouvertes.
+
+    python -m benchmarks.sessions --sessions 1 20 --reruns 400
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from supabase import create_client  # noqa: E402
+
+from benchmarks.fakes import FakePostgrest  # noqa: E402
+from supabase_client import SessionClient, create_http_client  # noqa: E402
+
+# Clé au format JWT : create_client refuse une clé qui n'en a pas la forme
+API_KEY = "eyJhbGciOiJIUzI1NiJ9.e30.bench"
+
+
+def run_case(server, sessions, reruns, new_client):
+    """`reruns` réexécutions réparties sur `sessions` threads ; renvoie les mesures."""
+    def rerun(_):
+        start = time.perf_counter()
+        new_client().table("meals").select("*").eq("user_id", "bench-user").execute()
+        return time.perf_counter() - start
+
+    connections = server.connections
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=sessions) as executor:
+        durations = list(executor.map(rerun, range(reruns)))
+    elapsed = time.perf_counter() - start
+    return {
+        "ms_p50": round(statistics.median(durations) * 1000, 1),
+        "ms_p99": round(float(np.percentile(durations, 99)) * 1000, 1),
+        "reruns_per_s": round(reruns / elapsed),
+        "connections": server.connections - connections,
+    }
+
+
+def run(session_counts, reruns, latency):
+    server = FakePostgrest(latency=latency)
+    http_client = create_http_client(pool_size=max(session_counts))
+    cases = {
+        "create_client": lambda: create_client(server.url, API_KEY),
+        "session_client": lambda: SessionClient(server.url, API_KEY, http_client, "jeton-de-session"),
+    }
+    results = []
+    try:
+        for sessions in session_counts:
+            for case, new_client in cases.items():
+                results.append({"sessions": sessions, "case": case, **run_case(server, sessions, reruns, new_client)})
+    finally:
+        http_client.close()
+        server.close()
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 20], help="Sessions simultanées")
+    parser.add_argument("--reruns", type=int, default=400, help="Réexécutions simulées par cas")
+    parser.add_argument("--latency", type=float, default=0.005, help="Latence simulée du serveur (s)")
+    parser.add_argument("--output", default=None, help="Fichier JSON des résultats (facultatif)")
+    args = parser.parse_args(argv)
+
+    results = run(args.sessions, args.reruns, args.latency)
+    for result in results:
+        print(
+            f"{result['sessions']:>3} sessions  {result['case']:<15} p50 {result['ms_p50']:>7.1f} ms  "
+            f"p99 {result['ms_p99']:>7.1f} ms  {result['reruns_per_s']:>5} réexécutions/s  "
+            f"{result['connections']} connexions ouvertes"
+        )
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"args": vars(args), "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
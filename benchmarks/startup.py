@@ -0,0 +1,127 @@
+"""Banc d'essai du démarrage : temps d'import et mémoire de chaque page dans un interpréteur neuf.
+
+Chaque page est mesurée dans son propre processus : import de Streamlit, première exécution
+du script (page par défaut, hors dépendances lourdes), puis premier affichage de la page,
+avec les modules qu'elle charge à la demande. Mémoire résidente relevée après chaque étape.
+
+    python -m benchmarks.startup --output startup.json
+"""
+import argparse
+import ast
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Dépendances dont on vérifie qu'elles ne sont chargées que par les pages qui s'en servent
+HEAVY_MODULES = ["numpy", "pandas", "pyarrow", "matplotlib", "sklearn", "st_aggrid", "PIL"]
+USER = {"id": "bench-user", "email": "bench@example.invalid"}
+
+
+def menu_pages():
+    """Entrées du menu, lues dans le dictionnaire PAGES de main.py sans exécuter le script."""
+    with open(os.path.join(REPO_ROOT, "main.py"), encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(getattr(t, "id", None) == "PAGES" for t in node.targets):
+            return list(ast.literal_eval(node.value))
+    raise ValueError("PAGES introuvable dans main.py")
+
+
+def measure_page(page, rows, timeout):
+    """Dans le processus courant (neuf) : temps et mémoire jusqu'au premier affichage de `page`."""
+    start = time.perf_counter()
+    sys.path.insert(0, REPO_ROOT)
+    from streamlit.testing.v1 import AppTest
+
+    import supabase_client
+    from benchmarks.fakes import FakeSpoonacular, FakeSupabase, seed_user
+    from benchmarks.run import rss_mb
+
+    import_ms = (time.perf_counter() - start) * 1000
+    import_rss = rss_mb()
+
+    db = FakeSupabase()
+    seed_user(db, USER["id"], rows)
+    supabase_client.SessionClient = db.session_client
+    spoonacular = FakeSpoonacular()
+    try:
+        at = AppTest.from_file(os.path.join(REPO_ROOT, "main.py"), default_timeout=timeout)
+        at.secrets["SUPABASE_URL"] = "http://supabase.invalid"
+        at.secrets["SUPABASE_KEY"] = "bench"
+        at.secrets["SPOONACULAR_API_KEY"] = "bench"
+        at.secrets["SPOONACULAR_URL"] = spoonacular.url
+        at.session_state["user"] = dict(USER)
+
+        start = time.perf_counter()
+        at.run()
+        script_ms = (time.perf_counter() - start) * 1000
+        script_rss = rss_mb()
+        default_modules = [name for name in HEAVY_MODULES if name in sys.modules]
+
+        start = time.perf_counter()
+        at.sidebar.selectbox[0].set_value(page).run()
+        page_ms = (time.perf_counter() - start) * 1000
+        errors = [str(e.value)[:200] for e in [*at.exception, *at.error]]
+    finally:
+        spoonacular.close()
+    return {
+        "page": page,
+        "import_ms": round(import_ms, 1),
+        "first_run_ms": round(script_ms, 1),
+        "page_ms": round(page_ms, 1),
+        "import_rss_mb": round(import_rss, 1),
+        "first_run_rss_mb": round(script_rss, 1),
+        "page_rss_mb": round(rss_mb(), 1),
+        "default_page_modules": default_modules,
+        "page_modules": [name for name in HEAVY_MODULES if name in sys.modules and name not in default_modules],
+        "errors": errors,
+    }
+
+
+def run(pages, rows, timeout):
+    """Mesure chaque page dans un sous-processus ; renvoie un dict par page."""
+    results = []
+    for page in pages:
+        with tempfile.TemporaryDirectory() as workdir:  # Caches sur disque propres à chaque mesure
+            output = subprocess.run(
+                [sys.executable, "-m", "benchmarks.startup", "--child", page, "--rows", str(rows)],
+                cwd=workdir, env={**os.environ, "PYTHONPATH": REPO_ROOT},
+                capture_output=True, text=True, check=True, timeout=timeout,
+            ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        results.append(result)
+        print(
+            f"{page:<28} imports {result['import_ms']:>7.1f} ms  1re exécution {result['first_run_ms']:>7.1f} ms  "
+            f"page {result['page_ms']:>7.1f} ms  {result['page_rss_mb']:>6.1f} Mo  "
+            f"chargés : {', '.join(result['page_modules']) or '-'}",
+            file=sys.stderr,
+        )
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", nargs="+", default=None, help="Pages du menu à mesurer (toutes par défaut)")
+    parser.add_argument("--rows", type=int, default=100, help="Taille de l'historique de l'utilisateur de test")
+    parser.add_argument("--timeout", type=float, default=300, help="Délai maximal par page (s)")
+    parser.add_argument("--output", default=None, help="Fichier JSON des résultats (facultatif)")
+    parser.add_argument("--child", default=None, help=argparse.SUPPRESS)  # Mesure d'une page dans ce processus
+    args = parser.parse_args(argv)
+
+    if args.child is not None:
+        print(json.dumps(measure_page(args.child, args.rows, args.timeout), ensure_ascii=False))
+        return
+
+    results = run(args.pages or menu_pages(), args.rows, args.timeout)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"args": vars(args), "results": results}, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
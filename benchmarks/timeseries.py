@@ -0,0 +1,86 @@
+"""Banc d'essai des séries de la page « Visualisations avancées » sur un long historique.
+
+Pour chaque période (jour, semaine, mois), mesure la construction des séries alignées
+(`calorie_series`), leur sous-échantillonnage (`downsample`) et le rendu du graphique
+(`charts.calories_chart`), sur des entraînements et repas synthétiques.
+
+    python -m benchmarks.timeseries --rows 100000 --days 9125 --output timeseries.json
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import matplotlib  # noqa: E402
+
+matplotlib.use("Agg")
+
+import charts  # noqa: E402
+from benchmarks.fakes import FakeSupabase, seed_user  # noqa: E402
+from frames import meals_frame, trainings_frame  # noqa: E402
+from timeseries import PERIODS, calorie_series, downsample  # noqa: E402
+
+USER_ID = "bench-user"
+
+
+def timed(func, repeat):
+    """Résultat du dernier appel et durée médiane (ms) de `repeat` appels."""
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        durations.append((time.perf_counter() - start) * 1000)
+    return result, round(statistics.median(durations), 1)
+
+
+def run(rows, days, repeat):
+    db = FakeSupabase()
+    seed_user(db, USER_ID, rows, days=days)
+    trainings, meals = trainings_frame(db.tables["trainings"]), meals_frame(db.tables["meals"])
+
+    results = []
+    for period in PERIODS:
+        series, series_ms = timed(lambda: calorie_series(trainings, meals, period), repeat)
+        sampled, downsample_ms = timed(
+            lambda: [downsample(series[column]) for column in ("burned", "consumed", "rolling_net")], repeat
+        )
+        _, render_ms = timed(lambda: charts.calories_chart(*sampled), repeat)
+        results.append({
+            "period": period,
+            "rows": rows,
+            "points": len(series),
+            "plotted_points": len(sampled[0]),
+            "series_ms": series_ms,
+            "downsample_ms": downsample_ms,
+            "render_ms": render_ms,
+        })
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100000, help="Entraînements et repas synthétiques (chacun)")
+    parser.add_argument("--days", type=int, default=9125, help="Durée de l'historique en jours (25 ans par défaut)")
+    parser.add_argument("--repeat", type=int, default=5, help="Mesures par étape (médiane)")
+    parser.add_argument("--output", default=None, help="Fichier JSON des résultats (facultatif)")
+    args = parser.parse_args(argv)
+
+    results = run(args.rows, args.days, args.repeat)
+    for result in results:
+        print(
+            f"{result['period']:<6} {result['points']:>6} points -> {result['plotted_points']:>4} tracés  "
+            f"séries {result['series_ms']:>7.1f} ms  sous-échantillonnage {result['downsample_ms']:>6.1f} ms  "
+            f"rendu {result['render_ms']:>7.1f} ms"
+        )
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"args": vars(args), "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""Banc d'essai de l'envoi des photos d'un repas vers Storage : envois en série ou en parallèle.
+
+Contre la base Supabase en mémoire (latence simulée par requête), compare :
+
+- l'ancien code : pour chaque photo, envoi du fichier brut puis insertion de sa ligne `meal_photos` ;
+- le même traitement que `upload_meal_photos` (image plafonnée et miniature), mais en série ;
+- `upload_meal_photos` (pool de processus, envois parallèles) suivi d'une insertion groupée.
+
+Un des fichiers est corrompu : il doit être signalé sans bloquer les autres (code de sortie 1 sinon).
+
+    python -m benchmarks.uploads --photos 10 --latency 0.05
+"""
+import argparse
+import io
+import json
+import os
+import sys
+import time
+import uuid
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from PIL import Image  # noqa: E402
+
+from benchmarks.fakes import FakeSupabase  # noqa: E402
+from images import process_image, process_images  # noqa: E402
+from repository import UserDataRepository  # noqa: E402
+from uploads import PHOTOS_BUCKET, upload_meal_photos  # noqa: E402
+
+USER_ID = "bench-user"
+PUBLIC_URL = f"http://supabase.invalid/storage/v1/object/public/{PHOTOS_BUCKET}"
+
+
+def photo_files(count, size):
+    """`count` photos JPEG (comme les UploadedFile de Streamlit), la dernière corrompue."""
+    files = []
+    for i in range(count):
+        buffer = io.BytesIO()
+        Image.new("RGB", size, (40 * i % 256, 90, 160)).save(buffer, "JPEG", quality=90)
+        data = buffer.getvalue() if i < count - 1 else b"pas une image"
+        uploaded_file = io.BytesIO(data)
+        uploaded_file.name = f"photo_{i}.jpg"
+        files.append(uploaded_file)
+    return files
+
+
+def sequential(client, meal_id, files):
+    """Ancien code : pour chaque photo, envoi du fichier brut puis insertion de sa ligne."""
+    for uploaded_file in files:
+        file_name = f"meals/{meal_id}_{uuid.uuid4()}.jpg"
+        client.storage.from_(PHOTOS_BUCKET).upload(file_name, uploaded_file.getvalue())
+        client.table("meal_photos").insert({"meal_id": meal_id, "photo_url": f"{PUBLIC_URL}/{file_name}"}).execute()
+    return len(files), []
+
+
+def sequential_processed(client, meal_id, files):
+    """Même travail que `upload_meal_photos`, photo après photo : traitement, deux envois, une insertion."""
+    stored, errors = 0, []
+    for uploaded_file in files:
+        try:
+            image, thumbnail = process_image(uploaded_file.getvalue())
+        except Exception as e:
+            errors.append((uploaded_file.name, str(e)))
+            continue
+        base_name = f"meals/{meal_id}_{uuid.uuid4()}"
+        bucket = client.storage.from_(PHOTOS_BUCKET)
+        bucket.upload(f"{base_name}.webp", image)
+        bucket.upload(f"{base_name}_thumb.webp", thumbnail)
+        client.table("meal_photos").insert({
+            "meal_id": meal_id,
+            "photo_url": f"{PUBLIC_URL}/{base_name}.webp",
+            "thumbnail_url": f"{PUBLIC_URL}/{base_name}_thumb.webp",
+        }).execute()
+        stored += 1
+    return stored, errors
+
+
+def pipelined(client, meal_id, files):
+    """`upload_meal_photos` (traitement, envois parallèles) puis une seule insertion."""
+    rows, errors = upload_meal_photos(client, PUBLIC_URL, meal_id, files)
+    UserDataRepository(client).add_meal_photos(USER_ID, rows)
+    return len(rows), errors
+
+
+CASES = {"legacy": sequential, "sequential": sequential_processed, "upload_meal_photos": pipelined}
+
+
+def measure(db, upload, files):
+    client = db.session_client()
+    before = db.counters()["queries"]
+    start = time.perf_counter()
+    stored, errors = upload(client, db.next_id(), files)
+    return {
+        "ms": round((time.perf_counter() - start) * 1000, 1),
+        "requests": db.counters()["queries"] - before,
+        "stored": stored,
+        "errors": [name for name, _ in errors],
+    }
+
+
+def run(photos, latency, size):
+    files = photo_files(photos, size)
+    process_images([files[0].getvalue()])  # Démarrage du pool de processus hors mesure
+    start = time.perf_counter()
+    process_images([uploaded_file.getvalue() for uploaded_file in files])
+    processing_ms = (time.perf_counter() - start) * 1000
+    db = FakeSupabase(latency=latency)
+    return {
+        "photos": photos,
+        "latency_ms": latency * 1000,
+        "cpus": os.cpu_count(),
+        "processing_only_ms": round(processing_ms, 1),
+        **{case: measure(db, upload, files) for case, upload in CASES.items()},
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--photos", type=int, default=10, help="Photos du repas, dont une corrompue")
+    parser.add_argument("--latency", type=float, default=0.05, help="Latence simulée par requête (s)")
+    parser.add_argument("--size", type=int, nargs=2, default=[1600, 1200], help="Dimensions des photos (px)")
+    parser.add_argument("--output", default=None, help="Fichier JSON des résultats (facultatif)")
+    args = parser.parse_args(argv)
+
+    result = run(args.photos, args.latency, tuple(args.size))
+    print(f"traitement seul (pool de processus, {result['cpus']} processeur(s)) : {result['processing_only_ms']:.1f} ms")
+    for case in CASES:
+        measured = result[case]
+        print(
+            f"{case:<19} {measured['ms']:>8.1f} ms  {measured['requests']:>3} requêtes  "
+            f"{measured['stored']} photos enregistrées  en erreur : {', '.join(measured['errors']) or '-'}"
+        )
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"args": vars(args), "result": result}, f, indent=2)
+    # La photo corrompue doit être signalée et les autres enregistrées
+    ok = result["upload_meal_photos"]["errors"] == [f"photo_{args.photos - 1}.jpg"] \
+        and result["upload_meal_photos"]["stored"] == args.photos - 1
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,48 @@
+"""Graphiques rendus en PNG avec l'API objet de matplotlib (sans l'état global de pyplot)."""
+import io
+
+from matplotlib.figure import Figure
+
+FIGURE_SIZE = (10, 5)
+DPI = 100
+
+
+def _render_png(draw):
+    """Crée une figure, la dessine avec `draw(ax)` puis la libère ; renvoie les octets PNG.
+
+    Les figures créées sans pyplot ne sont enregistrées nulle part : elles sont
+    indépendantes d'une session à l'autre et libérées dès la fin du rendu.
+    """
+    fig = Figure(figsize=FIGURE_SIZE, dpi=DPI)
+    try:
+        draw(fig.subplots())
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format="png")
+        return buffer.getvalue()
+    finally:
+        fig.clear()
+
+
+def calories_chart(burned, consumed, rolling_net):
+    """Courbes des calories brûlées et consommées, et du bilan net glissant (Series indexées par date)."""
+    def draw(ax):
+        marker = "o" if max(len(burned), len(consumed)) <= 60 else None  # Marqueurs lisibles seulement sur peu de points
+        ax.plot(burned.index, burned.to_numpy(), label="Calories brûlées", marker=marker)
+        ax.plot(consumed.index, consumed.to_numpy(), label="Calories consommées", marker=marker)
+        ax.plot(rolling_net.index, rolling_net.to_numpy(), label="Bilan net glissant", linestyle="--")
+        ax.set_xlabel("Date")
+        ax.set_ylabel("Calories")
+        ax.set_title("Calories brûlées vs consommées")
+        ax.legend()
+        ax.figure.autofmt_xdate()
+    return _render_png(draw)
+
+
+def durations_histogram(durations):
+    """Histogramme des durées d'entraînement."""
+    def draw(ax):
+        ax.hist(durations, bins=10, alpha=0.7)
+        ax.set_xlabel("Durée (min)")
+        ax.set_ylabel("Fréquence")
+        ax.set_title("Répartition des durées d'entraînement")
+    return _render_png(draw)
@@ -0,0 +1,70 @@
+"""Représentation en colonnes typées des repas et entraînements, construite une fois par requête."""
+import pandas as pd
+
+from repository import TRAINING_TYPES
+
+TRAINING_TYPE_DTYPE = pd.CategoricalDtype(TRAINING_TYPES)
+
+TRAINING_DTYPES = {
+    "id": "int64",
+    "training_type": TRAINING_TYPE_DTYPE,
+    "duration": "int32",
+    "calories_burned": "int32",
+}
+MEAL_DTYPES = {
+    "id": "int64",
+    "name": "category",  # Les mêmes noms de repas reviennent souvent
+    "calories": "int32",
+    "proteins": "float32",
+    "carbs": "float32",
+    "fats": "float32",
+}
+
+
+def _typed_frame(rows, dtypes):
+    """DataFrame aux types compacts : dates en datetime64, nombres sur 32 bits, catégories."""
+    frame = pd.DataFrame.from_records(rows, columns=["date", *dtypes, "updated_at"])
+    # Les dates Supabase peuvent être des jours ou des horodatages avec fuseau ; updated_at
+    # (dernière modification de la ligne) n'est renseigné que si la requête l'a demandé
+    for column in ("date", "updated_at"):
+        frame[column] = pd.to_datetime(frame[column], utc=True, format="ISO8601").dt.tz_localize(None)
+    for column, dtype in dtypes.items():
+        if dtype in ("int32", "int64"):
+            frame[column] = pd.to_numeric(frame[column]).fillna(0)
+    return frame.astype(dtypes)
+
+
+def _merge(frame, rows, dtypes):
+    """Fusionne des lignes ajoutées ou modifiées dans `frame` : une ligne par id, la plus récente l'emporte."""
+    delta = _typed_frame(rows, dtypes)
+    merged = pd.concat([frame[~frame["id"].isin(delta["id"])], delta], ignore_index=True)
+    # concat perd le type catégoriel quand les catégories diffèrent : on le rétablit
+    return merged.sort_values("id", ignore_index=True).astype(dtypes)
+
+
+def latest_update(rows, default=None):
+    """Horodatage `updated_at` le plus récent des lignes, ou `default` s'il n'y en a aucune."""
+    if not rows:
+        return default
+    latest = pd.to_datetime([row["updated_at"] for row in rows], utc=True, format="ISO8601").max()
+    return latest if default is None else max(latest, default)
+
+
+def trainings_frame(rows):
+    """Entraînements (liste de dicts Supabase) en colonnes typées, `training_type` catégoriel."""
+    return _typed_frame(rows, TRAINING_DTYPES)
+
+
+def meals_frame(rows):
+    """Repas (liste de dicts Supabase) en colonnes typées."""
+    return _typed_frame(rows, MEAL_DTYPES)
+
+
+def merge_trainings(frame, rows):
+    """Entraînements en cache mis à jour avec les lignes modifiées depuis le dernier chargement."""
+    return _merge(frame, rows, TRAINING_DTYPES)
+
+
+def merge_meals(frame, rows):
+    """Repas en cache mis à jour avec les lignes modifiées depuis le dernier chargement."""
+    return _merge(frame, rows, MEAL_DTYPES)
@@ -0,0 +1,69 @@
+"""Client HTTP partagé pour les API externes : connexions réutilisées, délais et nouvelles tentatives."""
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from metrics import timed
+
+# Délais (en secondes) d'établissement de la connexion et de lecture de la réponse
+CONNECT_TIMEOUT = 3.05
+READ_TIMEOUT = 10
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+# Attente maximale (en secondes) imposée par un en-tête Retry-After : au-delà, le thread du
+# script Streamlit et les sessions qui attendent la même réponse resteraient bloqués
+MAX_RETRY_AFTER = 2
+
+
+class CappedRetry(Retry):
+    """Nouvelles tentatives dont l'attente demandée par Retry-After est plafonnée à MAX_RETRY_AFTER."""
+
+    def get_retry_after(self, response):
+        retry_after = super().get_retry_after(response)
+        return None if retry_after is None else min(retry_after, MAX_RETRY_AFTER)
+
+
+def create_session(pool_size=10, retries=3, backoff_factor=0.5):
+    """Crée une session avec un pool de connexions et des tentatives espacées sur 429/5xx."""
+    retry = CappedRetry(
+        total=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset(["GET"]),
+        respect_retry_after_header=True,
+        raise_on_status=False,  # La dernière réponse en erreur est renvoyée à l'appelant
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+class HttpClient:
+    """Session HTTP partagée par le processus, avec délais par défaut."""
+
+    def __init__(self, session=None, connect_timeout=CONNECT_TIMEOUT, read_timeout=READ_TIMEOUT, max_workers=4):
+        self.session = session if session is not None else create_session(pool_size=max_workers)
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_workers = max_workers
+
+    def get(self, url, params=None):
+        with timed("http", urlsplit(url).netloc) as call:
+            response = self.session.get(url, params=params, timeout=self.timeout)
+            call["bytes"] = len(response.content)
+        return response
+
+    def map_concurrently(self, func, items):
+        """Applique `func` à chaque élément de `items` en parallèle ; résultats dans l'ordre des éléments."""
+        items = list(items)
+        if len(items) <= 1:
+            return [func(item) for item in items]
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(items))) as executor:
+            # Chaque tâche reçoit une copie du contexte : ses appels restent rattachés à l'exécution en cours
+            futures = [executor.submit(contextvars.copy_context().run, func, item) for item in items]
+            return [future.result() for future in futures]
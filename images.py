@@ -0,0 +1,81 @@
+"""Préparation des photos de repas : redimensionnement et miniatures, hors du thread de l'interface."""
+import io
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from PIL import Image, ImageOps
+
+MAX_DIMENSION = 2048  # Côté maximal de l'image conservée
+THUMBNAIL_DIMENSION = 400  # Affichée en 200 px : 2x pour les écrans haute densité
+IMAGE_FORMAT = "WEBP"
+IMAGE_EXTENSION = "webp"
+IMAGE_CONTENT_TYPE = "image/webp"
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _encode(image, max_dimension, quality):
+    image = image.copy()
+    image.thumbnail((max_dimension, max_dimension))
+    buffer = io.BytesIO()
+    image.save(buffer, IMAGE_FORMAT, quality=quality)
+    return buffer.getvalue()
+
+
+def process_image(data):
+    """Décode une photo une seule fois et renvoie (image plafonnée, miniature) ré-encodées en WebP."""
+    with Image.open(io.BytesIO(data)) as image:
+        image.draft("RGB", (MAX_DIMENSION, MAX_DIMENSION))  # JPEG : décodage directement à échelle réduite
+        image = ImageOps.exif_transpose(image)  # Appliquer l'orientation de l'appareil photo
+        image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+        return _encode(image, MAX_DIMENSION, quality=85), _encode(image, THUMBNAIL_DIMENSION, quality=75)
+
+
+def get_process_pool():
+    """Pool de processus partagé, créé au premier usage.
+
+    Démarrage en « spawn » : un fork du serveur Streamlit, multithreadé, peut hériter de verrous tenus.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=2, mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+
+def _discard_pool(pool):
+    """Oublie un pool cassé (processus de travail tué) : le prochain usage en crée un nouveau."""
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def process_images(images_data):
+    """Traite plusieurs photos dans le pool de processus.
+
+    Renvoie, dans l'ordre, soit (image, miniature), soit l'exception levée pour la photo.
+    Si un processus du pool meurt (par exemple tué faute de mémoire), les photos concernées
+    sont en erreur et le pool est recréé à l'appel suivant.
+    """
+    broken = BrokenProcessPool("Traitement de la photo interrompu : processus de traitement arrêté")
+    pool = get_process_pool()
+    try:
+        futures = [pool.submit(process_image, data) for data in images_data]
+    except BrokenProcessPool:
+        _discard_pool(pool)
+        return [broken for _ in images_data]
+    results = []
+    for future in futures:
+        try:
+            results.append(future.result())
+        except BrokenProcessPool:
+            _discard_pool(pool)
+            results.append(broken)
+        except Exception as e:
+            results.append(e)
+    return results
@@ -0,0 +1,163 @@
+"""Mesures de performance : compteurs et histogrammes du processus, détail de l'exécution en cours."""
+import contextvars
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger("appapoute.metrics")
+
+# Bornes (en secondes) des histogrammes de latence
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """Histogramme cumulatif au format Prometheus (compte par borne, somme, nombre)."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """Compteurs et histogrammes étiquetés, partagés par toutes les sessions du processus."""
+
+    def __init__(self):
+        self._counters = {}
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def inc(self, name, labels, value=1):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, labels, value):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(value)
+
+    def to_prometheus(self):
+        """Exposition au format texte de Prometheus."""
+        def fmt(labels, extra=()):
+            items = [*labels, *extra]
+            return "{" + ",".join(f'{k}="{v}"' for k, v in items) + "}" if items else ""
+
+        lines = []
+        with self._lock:
+            for name in sorted({name for name, _ in self._counters}):
+                lines.append(f"# TYPE {name} counter")
+                for (n, labels), value in sorted(self._counters.items()):
+                    if n == name:
+                        lines.append(f"{name}{fmt(labels)} {value}")
+            for name in sorted({name for name, _ in self._histograms}):
+                lines.append(f"# TYPE {name} histogram")
+                for (n, labels), h in sorted(self._histograms.items(), key=lambda item: item[0]):
+                    if n != name:
+                        continue
+                    for bound, count in zip(h.buckets, h.counts):
+                        lines.append(f"{name}_bucket{fmt(labels, [('le', bound)])} {count}")
+                    lines.append(f"{name}_bucket{fmt(labels, [('le', '+Inf')])} {h.count}")
+                    lines.append(f"{name}_sum{fmt(labels)} {h.sum:.6f}")
+                    lines.append(f"{name}_count{fmt(labels)} {h.count}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+
+class RerunTrace:
+    """Appels mesurés pendant une exécution du script : (type, cible, durée, octets)."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.calls = []
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def summary(self):
+        """Nombre d'appels, durée cumulée et octets reçus, par type et cible."""
+        totals = {}
+        for kind, target, seconds, size in self.calls:
+            entry = totals.setdefault((kind, target), {"calls": 0, "seconds": 0.0, "bytes": 0})
+            entry["calls"] += 1
+            entry["seconds"] += seconds
+            entry["bytes"] += size
+        return totals
+
+
+_current_trace = contextvars.ContextVar("current_trace", default=None)
+
+
+def start_rerun():
+    """Commence le détail d'une nouvelle exécution du script."""
+    trace = RerunTrace()
+    _current_trace.set(trace)
+    return trace
+
+
+def record(kind, target, seconds, size=0):
+    """Enregistre un appel (Supabase, HTTP externe, rendu de page) dans le registre et l'exécution en cours."""
+    labels = {"kind": kind, "target": target}
+    REGISTRY.inc("appapoute_calls_total", labels)
+    REGISTRY.inc("appapoute_response_bytes_total", labels, size)
+    REGISTRY.observe("appapoute_call_duration_seconds", labels, seconds)
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.calls.append((kind, target, seconds, size))
+
+
+@contextmanager
+def timed(kind, target):
+    """Mesure la durée du bloc ; le bloc peut renseigner `call["bytes"]`."""
+    call = {"bytes": 0}
+    start = time.perf_counter()
+    try:
+        yield call
+    finally:
+        record(kind, target, time.perf_counter() - start, call["bytes"])
+
+
+def log_rerun(trace, page):
+    """Écrit le détail d'une exécution dans les journaux."""
+    parts = [
+        f"{kind}:{target} n={entry['calls']} {entry['seconds'] * 1000:.0f}ms {entry['bytes']}B"
+        for (kind, target), entry in sorted(trace.summary().items())
+    ]
+    logger.info("rerun page=%r total=%.0fms %s", page, trace.elapsed() * 1000, " ".join(parts))
+
+
+def start_metrics_server(port, registry=REGISTRY):
+    """Expose le registre au format Prometheus sur http://0.0.0.0:`port`/metrics (thread en arrière-plan)."""
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path != "/metrics":
+                self.send_error(404)
+                return
+            body = registry.to_prometheus().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass  # Pas de ligne de journal par collecte
+
+    server = ThreadingHTTPServer(("0.0.0.0", port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
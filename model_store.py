@@ -0,0 +1,192 @@
+"""Modèles de prédiction des calories brûlées, mis en cache par utilisateur."""
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from repository import TRAINING_TYPES
+
+MODEL_CACHE_DIR = ".model_cache"
+# Version du format des fichiers de .model_cache : les fichiers d'une autre version sont ignorés
+MODEL_FORMAT_VERSION = 3
+# Pénalité (relative à l'échelle de XᵀX) sur les termes propres à chaque type d'entraînement
+TYPE_RIDGE = 1e-9
+
+
+def _latest_update(trainings):
+    """Dernière modification (`updated_at`) des entraînements, en ISO, ou None si inconnue."""
+    latest = trainings["updated_at"].max() if "updated_at" in trainings else pd.NaT
+    return None if pd.isna(latest) else latest.isoformat()
+
+
+def fingerprint(trainings):
+    """Empreinte des entraînements (DataFrame de frames.py) : nombre de lignes, id et date maximaux,
+    dernière modification (une ligne modifiée change l'empreinte sans changer les ids)."""
+    if trainings.empty:
+        return (0, None, None, None)
+    # Types Python natifs : l'empreinte est sérialisée en JSON
+    return (
+        len(trainings),
+        int(trainings["id"].max()),
+        trainings["date"].max().isoformat(),
+        _latest_update(trainings),
+    )
+
+
+def type_codes(training_types):
+    """Indice de chaque type dans TRAINING_TYPES (-1 si inconnu)."""
+    if isinstance(getattr(training_types, "dtype", None), pd.CategoricalDtype) \
+            and list(training_types.cat.categories) == TRAINING_TYPES:
+        return training_types.cat.codes.to_numpy()  # Déjà encodé : aucune comparaison de chaînes
+    return pd.Categorical(np.atleast_1d(np.asarray(training_types, dtype=object)), categories=TRAINING_TYPES).codes
+
+
+def design_matrix(durations, training_types):
+    """Matrice des variables : constante, durée, type encodé en one-hot et durée par type.
+
+    `training_types` peut être une seule valeur, appliquée à toutes les durées.
+    """
+    durations = np.asarray(durations, dtype=float).reshape(-1)
+    codes = np.broadcast_to(type_codes(training_types), durations.shape)
+    one_hot = (codes[:, None] == np.arange(len(TRAINING_TYPES))).astype(float)
+    return np.hstack([
+        np.ones((len(durations), 1)),
+        durations[:, None],
+        one_hot,
+        one_hot * durations[:, None],
+    ])
+
+
+class CalorieModel:
+    """Régression linéaire des calories brûlées sur la durée et le type d'entraînement.
+
+    Le modèle ne garde que les sommes des équations normales (XᵀX, Xᵀy), si bien
+    qu'ajouter un entraînement coûte O(1) quel que soit l'historique.
+    """
+
+    n_features = 2 + 2 * len(TRAINING_TYPES)
+
+    def __init__(self, n=0, xtx=None, xty=None, yty=0.0):
+        self.n = n
+        self.xtx = np.zeros((self.n_features, self.n_features)) if xtx is None else np.asarray(xtx, dtype=float)
+        self.xty = np.zeros(self.n_features) if xty is None else np.asarray(xty, dtype=float)
+        self.yty = yty
+        self._coef = None
+
+    def add_many(self, trainings):
+        """Ajoute des entraînements (DataFrame de frames.py) aux sommes courantes."""
+        if trainings.empty:
+            return
+        X = design_matrix(trainings["duration"].to_numpy(), trainings["training_type"])
+        y = trainings["calories_burned"].to_numpy(dtype=float)
+        self.n += len(y)
+        self.xtx += X.T @ X
+        self.xty += X.T @ y
+        self.yty += float(y @ y)
+        self._coef = None
+
+    @property
+    def coef_(self):
+        # La constante et le one-hot sont colinéaires : une légère pénalité sur les seuls termes
+        # propres à chaque type les annule pour les types sans données, qui retombent ainsi sur
+        # la droite commune (constante et pente globales).
+        if self._coef is None:
+            penalty = np.zeros(self.n_features)
+            penalty[2:] = TYPE_RIDGE * max(np.trace(self.xtx) / self.n_features, 1.0)
+            self._coef = np.linalg.pinv(self.xtx + np.diag(penalty)) @ self.xty
+        return self._coef
+
+    def predict(self, durations, training_types):
+        """Prédit les calories pour un tableau de durées et de types, en un seul calcul vectorisé."""
+        return design_matrix(durations, training_types) @ self.coef_
+
+    def predict_curves(self, durations):
+        """Courbes de calories prédites pour chaque type : tableau (len(TRAINING_TYPES), len(durations))."""
+        durations = np.asarray(durations, dtype=float)
+        predictions = self.predict(np.tile(durations, len(TRAINING_TYPES)), np.repeat(TRAINING_TYPES, len(durations)))
+        return predictions.reshape(len(TRAINING_TYPES), len(durations))
+
+    def score(self):
+        """Coefficient de détermination (R²) sur les données d'apprentissage."""
+        beta = self.coef_
+        mean_y = self.xty[0] / self.n  # La première variable est la constante : Σy
+        total = self.yty - self.n * mean_y ** 2
+        if total == 0:
+            return 1.0
+        residual = self.yty - 2 * beta @ self.xty + beta @ self.xtx @ beta
+        return 1 - residual / total
+
+    def to_dict(self):
+        return {"n": self.n, "xtx": self.xtx.tolist(), "xty": self.xty.tolist(), "yty": self.yty}
+
+
+class ModelStore:
+    """Modèles ajustés par utilisateur : LRU en mémoire, sérialisés sur disque.
+
+    Un modèle n'est recalculé que si l'empreinte des entraînements change ; lorsque
+    seuls de nouveaux entraînements sont arrivés, ils sont ajoutés incrémentalement.
+    """
+
+    def __init__(self, max_models=128, cache_dir=MODEL_CACHE_DIR):
+        self.max_models = max_models
+        self.cache_dir = cache_dir
+        self._models = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _path(self, user_id):
+        return os.path.join(self.cache_dir, f"{user_id}.json")
+
+    def _load(self, user_id):
+        try:
+            with open(self._path(user_id), encoding="utf-8") as f:
+                state = json.load(f)
+            if state.get("version") != MODEL_FORMAT_VERSION:
+                return None
+            model = CalorieModel(**state["model"])
+            if model.xtx.shape != (model.n_features, model.n_features):
+                return None  # Liste des types d'entraînement modifiée depuis la sauvegarde
+            return tuple(state["fingerprint"]), model
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):  # Fichier absent ou illisible
+            return None
+
+    def _save(self, user_id, fp, model):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with open(self._path(user_id), "w", encoding="utf-8") as f:
+            json.dump({"version": MODEL_FORMAT_VERSION, "fingerprint": list(fp), "model": model.to_dict()}, f)
+
+    def get_model(self, user_id, trainings):
+        """Renvoie le modèle de l'utilisateur, à jour vis-à-vis de `trainings`."""
+        fp = fingerprint(trainings)
+        with self._lock:
+            entry = self._models.get(user_id) or self._load(user_id)
+            if entry is not None and entry[0] == fp:
+                model = entry[1]
+            else:
+                model = self._update(entry, trainings)
+                self._save(user_id, fp, model)
+            self._models[user_id] = (fp, model)
+            self._models.move_to_end(user_id)
+            while len(self._models) > self.max_models:
+                self._models.popitem(last=False)
+            return model
+
+    def _update(self, entry, trainings):
+        """Ajoute les nouveaux entraînements au modèle existant, ou le recalcule entièrement."""
+        if entry is not None and entry[0][0]:
+            (count, max_id, _, last_update), model = entry
+            is_new = trainings["id"] > max_id
+            known_rows = trainings[~is_new]
+            # Ajout pur de lignes (anciennes lignes ni supprimées ni modifiées) : mise à jour
+            # incrémentale des sommes ; sinon le modèle est recalculé
+            if len(known_rows) == count and _latest_update(known_rows) == last_update:
+                new_rows = trainings[is_new]
+                model = CalorieModel(**model.to_dict())
+                model.add_many(new_rows)
+                return model
+
+        model = CalorieModel()
+        model.add_many(trainings)
+        return model
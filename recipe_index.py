@@ -0,0 +1,123 @@
+"""Catalogue local de recettes : recherche des plus proches voisins sur les macronutriments."""
+import csv
+import json
+import sqlite3
+import threading
+from contextlib import closing, contextmanager
+
+import numpy as np
+
+# Demi-largeurs de la fenêtre findByNutrients (voir spoonacular.nutrient_params) : calories,
+# protéines, glucides, lipides. Une distance de Tchebychev ≤ 1 sur ces échelles désigne une
+# recette que l'API aurait pu renvoyer pour la même demande.
+WINDOW = np.array([50.0, 5.0, 10.0, 5.0])
+NUTRIENTS = ("calories", "protein", "carbs", "fat")
+
+
+def macros(recipe):
+    """(calories, protéines, glucides, lipides) d'une recette Spoonacular ("29g" -> 29.0), ou None si incomplète."""
+    try:
+        return [float(str(recipe[nutrient]).strip().rstrip("g")) for nutrient in NUTRIENTS]
+    except (KeyError, ValueError):
+        return None
+
+
+class RecipeIndex:
+    """Recettes connues, indexées par un KD-tree sur leurs macronutriments.
+
+    Le catalogue est conservé dans la base SQLite du cache Spoonacular (table `catalog`) et
+    enrichi par chaque réponse de l'API ; l'arbre est reconstruit à la requête suivante.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self._lock = threading.Lock()
+        self._recipes = []
+        self._rows = []
+        self._ids = set()
+        self._tree = None
+        self._tree_recipes = []
+        self._stale = False
+        if path is not None:
+            self._load()
+
+    def __len__(self):
+        return len(self._recipes)
+
+    @contextmanager
+    def _connect(self):
+        """Connexion validée (ou annulée en cas d'erreur) puis fermée à la fin du bloc."""
+        with closing(sqlite3.connect(self.path, timeout=10)) as conn, conn:
+            conn.execute("create table if not exists catalog (id integer primary key, value text not null)")
+            yield conn
+
+    def _load(self):
+        """Charge le catalogue, complété par les réponses déjà présentes dans le cache Spoonacular."""
+        with self._connect() as conn:
+            values = [row[0] for row in conn.execute("select value from catalog")]
+            has_cache = conn.execute("select 1 from sqlite_master where name = 'recipes'").fetchone()
+            cached = [row[0] for row in conn.execute("select value from recipes")] if has_cache else []
+        self._add([json.loads(value) for value in values])
+        self.add([recipe for value in cached for recipe in json.loads(value)])
+
+    def _add(self, recipes):
+        """Ajoute les recettes nouvelles et complètes ; renvoie celles qui ont été retenues."""
+        added = []
+        with self._lock:
+            for recipe in recipes:
+                values = macros(recipe)
+                if values is None or recipe.get("id") in self._ids:
+                    continue
+                self._ids.add(recipe.get("id"))
+                self._recipes.append(recipe)
+                self._rows.append(values)
+                added.append(recipe)
+            self._stale = self._stale or bool(added)
+        return added
+
+    def add(self, recipes):
+        """Ajoute des recettes au catalogue (et à sa sauvegarde SQLite)."""
+        added = self._add(recipes)
+        if added and self.path is not None:
+            with self._connect() as conn:
+                conn.executemany(
+                    "insert or ignore into catalog (id, value) values (?, ?)",
+                    [(recipe["id"], json.dumps(recipe)) for recipe in added],
+                )
+        return len(added)
+
+    def import_csv(self, path):
+        """Ajoute un catalogue fourni en CSV (colonnes id, title, image, calories, protein, carbs, fat)."""
+        with open(path, newline="", encoding="utf-8") as f:
+            recipes = [{**row, "id": int(row["id"])} for row in csv.DictReader(f)]
+        return self.add(recipes)
+
+    def _current_tree(self):
+        """Arbre à jour et recettes qu'il indexe (copie figée : des ajouts concurrents ne la modifient pas)."""
+        with self._lock:
+            if self._stale:
+                from sklearn.neighbors import KDTree  # Import différé : sklearn n'est chargé qu'à la première recherche
+
+                matrix = np.asarray(self._rows, dtype=float) / WINDOW
+                self._tree = KDTree(matrix, metric="chebyshev") if len(matrix) else None
+                self._tree_recipes = list(self._recipes)
+                self._stale = False
+            return self._tree, self._tree_recipes
+
+    def query_many(self, profiles, k=3):
+        """Pour chaque profil (calories, protéines, glucides, lipides), jusqu'à `k` recettes dans la
+        fenêtre de l'API, les plus proches d'abord. Une seule recherche vectorisée pour tous les profils.
+        """
+        tree, recipes = self._current_tree()
+        if tree is None or not profiles:
+            return [[] for _ in profiles]
+        points = np.asarray(profiles, dtype=float).reshape(-1, len(NUTRIENTS)) / WINDOW
+        distances, indices = tree.query(points, k=min(k, len(recipes)))
+        return [
+            [recipes[i] for distance, i in zip(row_distances, row_indices) if distance <= 1.0]
+            for row_distances, row_indices in zip(distances, indices)
+        ]
+
+    def query(self, calories, proteins, carbs, fats, k=3):
+        """Jusqu'à `k` recettes dans la fenêtre de l'API autour des besoins, les plus proches d'abord."""
+        return self.query_many([(calories, proteins, carbs, fats)], k)[0]
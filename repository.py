@@ -0,0 +1,256 @@
+"""Accès aux données Supabase avec un cache par utilisateur (LRU borné + TTL)."""
+import copy
+import threading
+import time
+from collections import OrderedDict
+from datetime import date as date_type, datetime, timedelta, timezone
+
+# Nombre d'identifiants par requête "in" pour rester sous la limite de taille d'URL de PostgREST
+PHOTOS_BATCH_SIZE = 200
+
+# Colonnes explicitement projetées : on ne transfère que ce que les pages affichent
+MEAL_COLUMNS = "id, user_id, date, name, calories, proteins, carbs, fats"
+TRAINING_COLUMNS = "id, user_id, date, training_type, duration, calories_burned"
+PHOTO_COLUMNS = "id, meal_id, photo_url, thumbnail_url"
+DEFAULT_PAGE_SIZE = 20
+
+# Historiques complets tenus à jour par chargements incrémentaux (voir UserDataRepository._dataset)
+DATASET_TABLES = ("meals", "trainings")
+# Recouvrement du curseur updated_at : rattrape les écritures validées après leur horodatage
+# (now() vaut l'heure de début de la transaction)
+DELTA_OVERLAP = timedelta(seconds=5)
+
+# Types d'entraînement proposés (mêmes catégories que les pictogrammes de get_training_icon)
+TRAINING_TYPES = ["Course", "Vélo", "Musculation", "Natation", "Marche"]
+
+
+def window_start(period, today=None):
+    """Premier jour de la fenêtre `period` ("day", "week" ou "month") contenant `today`."""
+    today = today or date_type.today()
+    if period == "day":
+        return today
+    if period == "week":
+        return today - timedelta(days=today.weekday())  # Lundi de la semaine en cours
+    if period == "month":
+        return today.replace(day=1)
+    raise ValueError(f"Période inconnue : {period}")
+
+
+class TTLCache:
+    """Cache borné en nombre d'entrées (éviction LRU) dont les entrées expirent après `ttl` secondes."""
+
+    def __init__(self, max_entries=256, ttl=300):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.deltas = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Renvoie (trouvé, valeur) et met à jour les compteurs."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return False, None
+
+    def peek(self, key):
+        """Renvoie (trouvé, valeur) sans toucher aux compteurs : l'appelant compte avec `count_load`."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                return True, entry[1]
+            return False, None
+
+    def count_load(self, partial):
+        """Compte un chargement d'historique : partiel (lignes modifiées seulement) ou complet (miss)."""
+        with self._lock:
+            if partial:
+                self.deltas += 1
+            else:
+                self.misses += 1
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, predicate):
+        """Supprime toutes les entrées dont la clé satisfait `predicate`."""
+        with self._lock:
+            for key in [k for k in self._entries if predicate(k)]:
+                del self._entries[key]
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "deltas": self.deltas, "entries": len(self._entries)}
+
+
+class UserDataRepository:
+    """Lecture/écriture des repas et entraînements, avec cache invalidé à chaque écriture."""
+
+    def __init__(self, client, cache=None):
+        self.client = client
+        self.cache = cache if cache is not None else TTLCache()
+
+    def with_client(self, client):
+        """Même cache, requêtes envoyées avec `client` (par exemple la vue Supabase d'une session)."""
+        view = copy.copy(self)
+        view.client = client
+        return view
+
+    def _cached(self, key, loader):
+        found, value = self.cache.get(key)
+        if not found:
+            value = loader()
+            self.cache.set(key, value)
+        return value
+
+    def invalidate(self, user_id):
+        """Oublie les données en cache d'un utilisateur dérivées de ses historiques (pages, totaux, photos).
+
+        Les historiques complets restent en cache : leur prochaine lecture ne récupère que les
+        lignes modifiées.
+        """
+        self.cache.invalidate(lambda key: key[1] == user_id and key[0] not in DATASET_TABLES)
+
+    def _dataset(self, table, columns, user_id, to_frame, merge):
+        """Historique complet de `table` pour un utilisateur, tenu à jour de façon incrémentale.
+
+        Le premier chargement récupère toutes les lignes ; les suivants seulement celles dont
+        `updated_at` dépasse le curseur, fusionnées par id dans le DataFrame en cache. Une écriture
+        faite depuis un autre onglet ou une autre session est ainsi vue à la lecture suivante.
+        """
+        from frames import latest_update  # Import différé : pandas n'est chargé que par les pages qui l'utilisent
+
+        key = (table, user_id)
+        # Chaque lecture envoie une requête : ce n'est jamais un hit, au mieux un chargement partiel
+        found, dataset = self.cache.peek(key)
+        self.cache.count_load(partial=found)
+        fetched_at = datetime.now(timezone.utc)
+        query = self.client.table(table).select(f"{columns}, updated_at").eq("user_id", user_id)
+        if found and dataset["cursor"] is not None:
+            since = dataset["cursor"]
+            if dataset["fetched_at"] - since < DELTA_OVERLAP:
+                # Curseur récent : une transaction encore ouverte au dernier chargement a pu
+                # horodater ses lignes avant lui
+                since -= DELTA_OVERLAP
+            query = query.gt("updated_at", since.isoformat())
+        response = query.execute()
+        rows = response.data if response else []
+
+        if not found:
+            dataset = {"frame": to_frame(rows), "cursor": latest_update(rows)}
+        elif rows:
+            cursor = latest_update(rows, dataset["cursor"])
+            if cursor != dataset["cursor"]:
+                # Nouvelles lignes : les pages et totaux en cache de l'utilisateur sont périmés
+                self.invalidate(user_id)
+            dataset = {"frame": merge(dataset["frame"], rows), "cursor": cursor}
+        dataset["fetched_at"] = fetched_at
+        self.cache.set(key, dataset)
+        return dataset["frame"]
+
+    def get_meals_frame(self, user_id):
+        """Récupère les repas d'un utilisateur, en colonnes typées (voir frames.py)."""
+        from frames import meals_frame, merge_meals
+
+        return self._dataset("meals", MEAL_COLUMNS, user_id, meals_frame, merge_meals)
+
+    def get_trainings_frame(self, user_id):
+        """Récupère les entraînements d'un utilisateur, en colonnes typées (voir frames.py)."""
+        from frames import merge_trainings, trainings_frame
+
+        return self._dataset("trainings", TRAINING_COLUMNS, user_id, trainings_frame, merge_trainings)
+
+    def _fetch_page(self, table, columns, user_id, page, page_size):
+        """Récupère une page triée par date puis id (les plus récents d'abord) et le nombre total de lignes."""
+        start = page * page_size
+        response = (
+            self.client.table(table)
+            .select(columns, count="exact")
+            .eq("user_id", user_id)
+            .order("date", desc=True)
+            .order("id", desc=True)
+            .range(start, start + page_size - 1)
+            .execute()
+        )
+        return (response.data, response.count or 0) if response else ([], 0)
+
+    def get_meals_page(self, user_id, page=0, page_size=DEFAULT_PAGE_SIZE):
+        """Récupère une page de repas et le nombre total de repas de l'utilisateur."""
+        return self._cached(
+            ("meals_page", user_id, page, page_size),
+            lambda: self._fetch_page("meals", MEAL_COLUMNS, user_id, page, page_size),
+        )
+
+    def get_trainings_page(self, user_id, page=0, page_size=DEFAULT_PAGE_SIZE):
+        """Récupère une page d'entraînements et le nombre total d'entraînements de l'utilisateur."""
+        return self._cached(
+            ("trainings_page", user_id, page, page_size),
+            lambda: self._fetch_page("trainings", TRAINING_COLUMNS, user_id, page, page_size),
+        )
+
+    def get_calorie_totals(self, user_id, period="week"):
+        """Totaux de calories brûlées/consommées sur la fenêtre `period`, agrégés par Postgres."""
+        since = window_start(period)
+
+        def load():
+            response = self.client.rpc(
+                "calorie_totals", {"p_user_id": user_id, "p_since": since.isoformat()}
+            ).execute()
+            rows = response.data if response else []
+            if not rows:
+                return {"calories_burned": 0, "calories_consumed": 0, "training_count": 0, "meal_count": 0}
+            return rows[0]
+        return self._cached(("totals", user_id, period, since), load)
+
+    def get_meals_photos(self, user_id, meal_ids):
+        """Récupère en lot les photos de plusieurs repas, regroupées par meal_id."""
+        def load():
+            photos_by_meal = {meal_id: [] for meal_id in meal_ids}
+            for start in range(0, len(meal_ids), PHOTOS_BATCH_SIZE):
+                batch = meal_ids[start:start + PHOTOS_BATCH_SIZE]
+                response = self.client.table("meal_photos").select(PHOTO_COLUMNS).in_("meal_id", batch).execute()
+                for photo in (response.data if response else []):
+                    photos_by_meal.setdefault(photo["meal_id"], []).append(photo)
+            return photos_by_meal
+        return self._cached(("photos", user_id, tuple(meal_ids)), load)
+
+    def add_meal(self, meal_data):
+        """Ajoute un repas et invalide le cache de l'utilisateur."""
+        response = self.client.table("meals").insert(meal_data).execute()
+        self.invalidate(meal_data["user_id"])
+        return response
+
+    def add_meal_photos(self, user_id, photo_rows):
+        """Insère en une seule requête les photos d'un repas et invalide le cache de l'utilisateur."""
+        if not photo_rows:
+            return None
+        response = self.client.table("meal_photos").insert(photo_rows).execute()
+        self.invalidate(user_id)
+        return response
+
+    def add_training(self, user_id, training_type, date, duration, calories_burned):
+        """Ajoute un entraînement pour un utilisateur."""
+        # Convertir la date en format ISO (YYYY-MM-DD)
+        date_str = date.strftime("%Y-%m-%d") if isinstance(date, datetime) else str(date)
+
+        response = self.client.table("trainings").insert({
+            "user_id": user_id,
+            "training_type": training_type,
+            "date": date_str,  # Utilisation de la date convertie
+            "duration": duration,
+            "calories_burned": calories_burned,
+        }).execute()
+        self.invalidate(user_id)
+        return response
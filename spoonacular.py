@@ -0,0 +1,214 @@
+"""Client Spoonacular avec catalogue local, cache persistant (SQLite) et regroupement des requêtes identiques."""
+import json
+import sqlite3
+import threading
+import time
+from contextlib import closing, contextmanager
+
+from http_client import HttpClient
+from recipe_index import RecipeIndex
+
+FIND_BY_NUTRIENTS_URL = "https://api.spoonacular.com/recipes/findByNutrients"
+RECIPE_CACHE_PATH = ".spoonacular_cache.sqlite3"
+
+# Taille des paliers : des besoins proches partagent la même entrée de cache
+CALORIES_BUCKET = 25
+MACRO_BUCKET = 5
+
+
+class SpoonacularError(Exception):
+    """Réponse en erreur de l'API Spoonacular."""
+
+
+def bucket(value, size):
+    """Arrondit `value` au palier de taille `size` le plus proche."""
+    return int(round(float(value) / size) * size)
+
+
+def nutrient_params(calories, proteins, carbs, fats, number=3):
+    """Paramètres findByNutrients (±50 kcal, ±5 g, ±10 g de glucides) calculés sur les valeurs arrondies."""
+    calories = bucket(calories, CALORIES_BUCKET)
+    proteins, carbs, fats = (bucket(v, MACRO_BUCKET) for v in (proteins, carbs, fats))
+    return {
+        "minCalories": max(0, calories - 50),
+        "maxCalories": calories + 50,
+        "minProtein": max(0, proteins - 5),
+        "maxProtein": proteins + 5,
+        "minCarbs": max(0, carbs - 10),
+        "maxCarbs": carbs + 10,
+        "minFat": max(0, fats - 5),
+        "maxFat": fats + 5,
+        "number": number,  # Nombre de recettes à récupérer
+    }
+
+
+class RecipeCache:
+    """Cache SQLite des réponses, avec expiration (TTL) et éviction des entrées les moins utilisées."""
+
+    def __init__(self, path=RECIPE_CACHE_PATH, ttl=24 * 3600, max_entries=1000):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        with self._connect() as conn:
+            conn.execute(
+                "create table if not exists recipes ("
+                " key text primary key, value text not null,"
+                " expires_at real not null, last_access real not null)"
+            )
+
+    @contextmanager
+    def _connect(self):
+        """Connexion validée (ou annulée en cas d'erreur) puis fermée à la fin du bloc."""
+        with closing(sqlite3.connect(self.path, timeout=10)) as conn, conn:
+            yield conn
+
+    def get(self, key):
+        """Renvoie la valeur en cache, ou None si absente ou expirée."""
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            row = conn.execute("select value, expires_at from recipes where key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if row[1] <= now:
+                conn.execute("delete from recipes where key = ?", (key,))
+                return None
+            conn.execute("update recipes set last_access = ? where key = ?", (now, key))
+            return json.loads(row[0])
+
+    def set(self, key, value):
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "insert or replace into recipes (key, value, expires_at, last_access) values (?, ?, ?, ?)",
+                (key, json.dumps(value), now + self.ttl, now),
+            )
+            conn.execute("delete from recipes where expires_at <= ?", (now,))
+            conn.execute(
+                "delete from recipes where key in ("
+                " select key from recipes order by last_access desc limit -1 offset ?)",
+                (self.max_entries,),
+            )
+
+
+class SpoonacularClient:
+    """Recherche de recettes par nutriments, mise en cache et partagée entre les sessions.
+
+    Les recettes sont d'abord cherchées dans le catalogue local (plus proches voisins sur les
+    macronutriments) ; l'API n'est appelée que s'il ne contient pas assez de recettes dans la
+    fenêtre demandée, et ses réponses enrichissent le catalogue. Quand plusieurs sessions
+    demandent le même palier en même temps, un seul appel est envoyé à l'API et les autres
+    attendent son résultat.
+    """
+
+    def __init__(self, api_key, cache=None, url=FIND_BY_NUTRIENTS_URL, http=None, index=None):
+        self.api_key = api_key
+        self.cache = cache if cache is not None else RecipeCache()
+        self.url = url
+        self.http = http if http is not None else HttpClient()
+        self.index = index if index is not None else RecipeIndex(self.cache.path)
+        self.local_hits = 0
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.upstream_seconds = 0.0
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+    def find_by_nutrients(self, calories, proteins, carbs, fats, number=3):
+        """Renvoie les recettes correspondant aux macronutriments (liste de dicts)."""
+        local = self.index.query(calories, proteins, carbs, fats, k=number)
+        if len(local) == number:
+            with self._lock:
+                self.local_hits += 1
+            return local
+        try:
+            return self._find_remote(nutrient_params(calories, proteins, carbs, fats, number))
+        except Exception:
+            # API indisponible : les quelques recettes locales valent mieux qu'aucune
+            if local:
+                return local
+            raise
+
+    def _find_remote(self, params):
+        """Réponse en cache pour ces paramètres, sinon appel à l'API (un seul pour les demandes simultanées)."""
+        key = json.dumps(params, sort_keys=True)
+
+        recipes = self.cache.get(key)
+        if recipes is not None:
+            with self._lock:
+                self.hits += 1
+            return recipes
+
+        with self._lock:
+            self.misses += 1
+            call = self._in_flight.get(key)
+            leader = call is None
+            if leader:
+                call = self._in_flight[key] = {"done": threading.Event(), "result": None, "error": None}
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call["done"].wait()
+            if call["error"] is not None:
+                raise call["error"]
+            return call["result"]
+
+        try:
+            call["result"] = self._fetch(params)
+            self.cache.set(key, call["result"])
+            self.index.add(call["result"])
+            return call["result"]
+        except Exception as e:
+            call["error"] = e
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+            call["done"].set()
+
+    def find_many(self, profiles, number=3):
+        """Recherche plusieurs profils (calories, protéines, glucides, lipides).
+
+        Le catalogue local est interrogé en une fois ; les profils qu'il ne couvre pas sont
+        cherchés en parallèle.
+        """
+        profiles = list(profiles)
+        results = self.index.query_many(profiles, k=number)
+        missing = [i for i, recipes in enumerate(results) if len(recipes) < number]
+        with self._lock:
+            self.local_hits += len(profiles) - len(missing)
+        fetched = self.http.map_concurrently(
+            lambda i: self.find_by_nutrients(*profiles[i], number=number), missing
+        )
+        for i, recipes in zip(missing, fetched):
+            results[i] = recipes
+        return results
+
+    def _fetch(self, params):
+        start = time.perf_counter()
+        try:
+            response = self.http.get(self.url, params={**params, "apiKey": self.api_key})
+        finally:
+            with self._lock:
+                self.upstream_seconds += time.perf_counter() - start
+        if response.status_code != 200:
+            raise SpoonacularError(response.text)
+        return response.json()
+
+    def stats(self):
+        """Taux de succès (catalogue local et cache) et latence moyenne des appels à l'API."""
+        with self._lock:
+            lookups = self.local_hits + self.hits + self.misses
+            upstream_calls = self.misses - self.coalesced
+            return {
+                "local_hits": self.local_hits,
+                "catalog_size": len(self.index),
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "hit_rate": (self.local_hits + self.hits) / lookups if lookups else 0.0,
+                "upstream_calls": upstream_calls,
+                "avg_upstream_ms": 1000 * self.upstream_seconds / upstream_calls if upstream_calls else 0.0,
+            }
@@ -0,0 +1,27 @@
+-- Totaux de calories d'un utilisateur depuis une date donnée, agrégés côté Postgres.
+-- Utilisé par la page "Suggestions personnalisées" pour ne plus charger les lignes brutes.
+create or replace function public.calorie_totals(p_user_id uuid, p_since date)
+returns table (
+    calories_burned bigint,
+    calories_consumed bigint,
+    training_count bigint,
+    meal_count bigint
+)
+language sql
+stable
+security invoker
+as $$
+    select
+        coalesce((select sum(t.calories_burned) from public.trainings t
+                  where t.user_id = p_user_id and t.date >= p_since), 0)::bigint,
+        coalesce((select sum(m.calories) from public.meals m
+                  where m.user_id = p_user_id and m.date >= p_since), 0)::bigint,
+        (select count(*) from public.trainings t
+         where t.user_id = p_user_id and t.date >= p_since),
+        (select count(*) from public.meals m
+         where m.user_id = p_user_id and m.date >= p_since);
+$$;
+
+-- Index servant à la fois aux agrégats par fenêtre et à la pagination par date
+create index if not exists trainings_user_id_date_idx on public.trainings (user_id, date desc, id desc);
+create index if not exists meals_user_id_date_idx on public.meals (user_id, date desc, id desc);
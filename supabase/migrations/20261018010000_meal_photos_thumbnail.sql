@@ -0,0 +1,2 @@
+-- Miniature de chaque photo, affichée dans la liste des repas à la place de l'original.
+alter table public.meal_photos add column if not exists thumbnail_url text;
@@ -0,0 +1,7 @@
+-- Clé d'idempotence des lignes importées en lot : réimporter un fichier ne crée pas de doublons.
+-- Les lignes saisies dans les formulaires gardent une clé nulle, que l'index unique ignore.
+alter table public.meals add column if not exists import_key text;
+alter table public.trainings add column if not exists import_key text;
+
+create unique index if not exists meals_user_import_key_idx on public.meals (user_id, import_key);
+create unique index if not exists trainings_user_import_key_idx on public.trainings (user_id, import_key);
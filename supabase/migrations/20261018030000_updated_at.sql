@@ -0,0 +1,25 @@
+-- Horodatage de dernière modification : l'application ne relit que les lignes modifiées
+-- depuis son dernier chargement (curseur sur updated_at).
+alter table public.meals add column if not exists updated_at timestamptz not null default now();
+alter table public.trainings add column if not exists updated_at timestamptz not null default now();
+
+create or replace function public.set_updated_at()
+returns trigger
+language plpgsql
+as $$
+begin
+  new.updated_at := now();
+  return new;
+end;
+$$;
+
+drop trigger if exists meals_set_updated_at on public.meals;
+create trigger meals_set_updated_at before update on public.meals
+  for each row execute function public.set_updated_at();
+
+drop trigger if exists trainings_set_updated_at on public.trainings;
+create trigger trainings_set_updated_at before update on public.trainings
+  for each row execute function public.set_updated_at();
+
+create index if not exists meals_user_updated_at_idx on public.meals (user_id, updated_at);
+create index if not exists trainings_user_updated_at_idx on public.trainings (user_id, updated_at);
@@ -0,0 +1,107 @@
+"""Connexions Supabase : transport HTTP partagé par le processus et vues légères par session."""
+import time
+
+import httpx
+from postgrest import SyncPostgrestClient
+from storage3 import SyncStorageClient
+from supabase import ClientOptions, create_client
+
+from metrics import timed
+
+# Marge avant expiration au-delà de laquelle le jeton d'accès est renouvelé
+TOKEN_REFRESH_MARGIN = 60
+
+
+class MeasuredTransport(httpx.BaseTransport):
+    """Transport httpx qui mesure chaque requête Supabase : durée, octets reçus, cible."""
+
+    def __init__(self, transport):
+        self.transport = transport
+
+    def handle_request(self, request):
+        # /rest/v1/meals -> "rest:meals", /auth/v1/token -> "auth:token"
+        parts = request.url.path.strip("/").split("/")
+        target = f"{parts[0]}:{parts[2]}" if len(parts) > 2 else request.url.path
+        with timed("supabase", f"{request.method} {target}") as call:
+            response = self.transport.handle_request(request)
+            response.read()
+            call["bytes"] = len(response.content)
+        return response
+
+    def close(self):
+        self.transport.close()
+
+
+def create_http_client(pool_size=20, connect_timeout=3.05, read_timeout=10):
+    """Client httpx partagé : pool de connexions keep-alive réutilisé par toutes les sessions."""
+    limits = httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size)
+    return httpx.Client(
+        transport=MeasuredTransport(httpx.HTTPTransport(limits=limits)),
+        timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+    )
+
+
+class SessionClient:
+    """Vue Supabase d'une session : connexions partagées, en-têtes portant le jeton de l'utilisateur.
+
+    Créer une vue ne fait qu'assembler des en-têtes ; aucune connexion n'est ouverte.
+    Les requêtes passent ainsi les règles RLS avec l'identité de l'utilisateur connecté.
+    """
+
+    def __init__(self, url, key, http_client, access_token=None):
+        self.url = url
+        self.key = key
+        self.http_client = http_client
+        self.access_token = access_token
+        self.headers = {"apiKey": key, "Authorization": f"Bearer {access_token or key}"}
+        self._postgrest = None
+        self._storage = None
+        self._auth_client = None
+
+    @property
+    def postgrest(self):
+        if self._postgrest is None:
+            self._postgrest = SyncPostgrestClient(
+                f"{self.url}/rest/v1", headers=self.headers, http_client=self.http_client
+            )
+        return self._postgrest
+
+    @property
+    def storage(self):
+        if self._storage is None:
+            self._storage = SyncStorageClient(f"{self.url}/storage/v1", self.headers, http_client=self.http_client)
+        return self._storage
+
+    @property
+    def auth(self):
+        """Client d'authentification propre à la session (jamais partagé entre utilisateurs)."""
+        if self._auth_client is None:
+            options = ClientOptions(persist_session=False, auto_refresh_token=False, httpx_client=self.http_client)
+            self._auth_client = create_client(self.url, self.key, options)
+        return self._auth_client.auth
+
+    def table(self, table_name):
+        return self.postgrest.from_(table_name)
+
+    def rpc(self, fn, params=None):
+        return self.postgrest.rpc(fn, params or {})
+
+
+def session_user(session, user):
+    """Informations de session conservées dans `st.session_state["user"]`."""
+    return {
+        "id": user.id,
+        "email": user.email,
+        "access_token": session.access_token,
+        "refresh_token": session.refresh_token,
+        "expires_at": session.expires_at,
+    }
+
+
+def refresh_if_expired(client, user):
+    """Renouvelle le jeton d'accès s'il expire bientôt ; renvoie les informations de session à jour."""
+    expires_at = user.get("expires_at")
+    if not user.get("refresh_token") or not expires_at or expires_at - TOKEN_REFRESH_MARGIN > time.time():
+        return user
+    response = client.auth.refresh_session(user["refresh_token"])
+    return session_user(response.session, response.user)
@@ -0,0 +1,74 @@
+"""Séries temporelles de calories : alignement journalier, ré-échantillonnage et sous-échantillonnage."""
+import numpy as np
+import pandas as pd
+
+# Période affichée : règle de ré-échantillonnage pandas et fenêtre du bilan glissant (en périodes)
+PERIODS = {
+    "day": ("D", 7),
+    "week": ("W", 4),
+    "month": ("MS", 3),
+}
+MAX_POINTS = 500  # Nombre maximal de points tracés par courbe
+
+
+def _daily_sum(frame, value_column):
+    """Somme journalière de `value_column` (Series indexée par jour)."""
+    return frame[value_column].astype(float).groupby(frame["date"].dt.normalize()).sum()
+
+
+def calorie_series(trainings, meals, period="day"):
+    """Calories brûlées, consommées et bilan net, alignés sur un index commun et triés.
+
+    `trainings` et `meals` sont les DataFrames typés de frames.py.
+
+    Les jours sans données valent 0 ; le bilan glissant est la somme du bilan net
+    sur les dernières périodes (7 jours, 4 semaines ou 3 mois).
+    """
+    rule, window = PERIODS[period]
+    daily = pd.DataFrame({
+        "burned": _daily_sum(trainings, "calories_burned"),
+        "consumed": _daily_sum(meals, "calories"),
+    }).fillna(0.0)
+    if daily.empty:
+        return daily.assign(net=[], rolling_net=[])
+
+    # Index journalier continu puis agrégation à la période demandée
+    daily = daily.reindex(pd.date_range(daily.index.min(), daily.index.max(), freq="D"), fill_value=0.0)
+    series = daily.resample(rule).sum()
+    series["net"] = series["burned"] - series["consumed"]
+    series["rolling_net"] = series["net"].rolling(window, min_periods=1).sum()
+    return series
+
+
+def lttb_indices(values, max_points):
+    """Indices retenus par l'algorithme Largest-Triangle-Three-Buckets.
+
+    Les points sont supposés régulièrement espacés (index temporel continu).
+    """
+    n = len(values)
+    if max_points >= n or max_points < 3:
+        return np.arange(n)
+
+    y = np.asarray(values, dtype=float)
+    x = np.arange(n, dtype=float)
+    # max_points - 2 seaux entre le premier et le dernier point, toujours conservés
+    edges = np.floor(np.linspace(1, n - 1, max_points - 1)).astype(int)
+    selected = np.empty(max_points, dtype=int)
+    selected[0], selected[-1] = 0, n - 1
+
+    a = 0
+    for i in range(max_points - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        # Aire du triangle (point précédent retenu, candidat, moyenne du seau suivant)
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def downsample(series, max_points=MAX_POINTS):
+    """Sous-échantillonne une Series en conservant sa forme visuelle (LTTB)."""
+    return series.iloc[lttb_indices(series.to_numpy(), max_points)]
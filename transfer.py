@@ -0,0 +1,174 @@
+"""Import et export en lot de l'historique (repas, entraînements) au format CSV ou Parquet."""
+import hashlib
+import json
+import os
+import tempfile
+from collections import Counter
+
+import pandas as pd
+
+from frames import MEAL_DTYPES, TRAINING_DTYPES
+from repository import TRAINING_TYPES
+
+IMPORT_BATCH_SIZE = 500  # Lignes par requête upsert
+READ_CHUNK_SIZE = 5000  # Lignes lues à la fois dans le fichier
+EXPORT_PAGE_SIZE = 1000  # Lignes lues à la fois dans Supabase
+
+# Types des colonnes de chaque table, repris de la représentation typée (hors id)
+DTYPES = {"meals": MEAL_DTYPES, "trainings": TRAINING_DTYPES}
+# Colonnes attendues dans les fichiers, par table
+SCHEMAS = {table: ["date", *(c for c in dtypes if c != "id")] for table, dtypes in DTYPES.items()}
+MAX_REPORTED_ERRORS = 50
+
+
+class ImportFormatError(ValueError):
+    """Fichier illisible ou colonnes manquantes."""
+
+
+def read_chunks(file, file_name, chunk_size=READ_CHUNK_SIZE):
+    """Lit le fichier par morceaux de `chunk_size` lignes (DataFrames), sans le charger entièrement."""
+    if file_name.lower().endswith(".parquet"):
+        import pyarrow.parquet as pq  # Import différé : pyarrow ne sert qu'aux fichiers Parquet
+
+        for batch in pq.ParquetFile(file).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    elif file_name.lower().endswith(".csv"):
+        yield from pd.read_csv(file, chunksize=chunk_size, dtype=str, keep_default_na=False)
+    else:
+        raise ImportFormatError("Format non pris en charge : utilisez un fichier .csv ou .parquet.")
+
+
+def validate_chunk(chunk, table, first_row=0):
+    """Convertit et vérifie un morceau du fichier.
+
+    Renvoie (DataFrame des lignes valides, liste de (numéro de ligne, message)).
+    """
+    columns = SCHEMAS[table]
+    missing = [c for c in columns if c not in chunk.columns]
+    if missing:
+        raise ImportFormatError(f"Colonnes manquantes : {', '.join(missing)}")
+
+    frame = chunk[columns].copy()
+    frame.index = pd.RangeIndex(first_row, first_row + len(frame))
+    problems = pd.Series("", index=frame.index)
+
+    dates = pd.to_datetime(frame["date"], errors="coerce", format="mixed")
+    problems[dates.isna()] += "date invalide; "
+    frame["date"] = dates.dt.strftime("%Y-%m-%d")
+
+    for column, dtype in DTYPES[table].items():
+        if dtype in ("int32", "float32"):
+            values = pd.to_numeric(frame[column], errors="coerce")
+            problems[values.isna() | (values < 0)] += f"{column} invalide; "
+            # Les colonnes entières de la base refusent les nombres décimaux
+            frame[column] = values.round().astype("Int64") if dtype == "int32" else values
+
+    if table == "meals":
+        frame["name"] = frame["name"].astype(str).str.strip()
+        problems[frame["name"] == ""] += "nom manquant; "
+    else:
+        problems[~frame["training_type"].isin(TRAINING_TYPES)] += "type d'entraînement inconnu; "
+
+    invalid = problems != ""
+    errors = [(row + 1, message.rstrip("; ")) for row, message in problems[invalid].items()]
+    return frame[~invalid], errors
+
+
+def _import_keys(user_id, table, frame, seen):
+    """Clés d'idempotence : empreinte du contenu de la ligne et de son rang parmi les lignes identiques.
+
+    Réimporter le même fichier produit les mêmes clés : l'upsert ne crée aucun doublon.
+    """
+    keys = []
+    for record in frame.itertuples(index=False):
+        content = json.dumps([user_id, table, *record], default=str)
+        seen[content] += 1
+        keys.append(hashlib.sha1(f"{content}#{seen[content]}".encode()).hexdigest())
+    return keys
+
+
+def import_file(client, user_id, table, file, file_name, batch_size=IMPORT_BATCH_SIZE):
+    """Importe un fichier CSV/Parquet dans `table` par upserts de `batch_size` lignes.
+
+    Renvoie un résumé : lignes importées, lignes déjà présentes (ignorées), lignes rejetées
+    et premières erreurs.
+    """
+    imported, skipped, rejected, errors = 0, 0, 0, []
+    seen = Counter()
+    # Numéros de ligne comptés comme dans le fichier : un CSV commence par une ligne d'en-tête
+    first_row = 1 if file_name.lower().endswith(".csv") else 0
+    for chunk in read_chunks(file, file_name):
+        valid, chunk_errors = validate_chunk(chunk, table, first_row)
+        first_row += len(chunk)
+        rejected += len(chunk_errors)
+        errors.extend(chunk_errors[:MAX_REPORTED_ERRORS - len(errors)])
+
+        valid = valid.assign(user_id=user_id, import_key=_import_keys(user_id, table, valid, seen))
+        records = valid.to_dict("records")
+        for start in range(0, len(records), batch_size):
+            batch = records[start:start + batch_size]
+            response = client.table(table).upsert(
+                batch, on_conflict="user_id,import_key", ignore_duplicates=True
+            ).execute()
+            # Seules les lignes réellement insérées sont renvoyées ; les doublons sont ignorés
+            inserted = len(response.data) if response else 0
+            imported += inserted
+            skipped += len(batch) - inserted
+    return {"imported": imported, "skipped": skipped, "rejected": rejected, "errors": errors}
+
+
+def iter_pages(client, user_id, table, page_size=EXPORT_PAGE_SIZE):
+    """Parcourt les lignes de l'utilisateur par pages triées par id (pagination par curseur)."""
+    last_id = None
+    while True:
+        query = client.table(table).select(", ".join(["id", *SCHEMAS[table]])).eq("user_id", user_id)
+        if last_id is not None:
+            query = query.gt("id", last_id)
+        rows = query.order("id").limit(page_size).execute().data
+        if not rows:
+            return
+        yield pd.DataFrame.from_records(rows, columns=["id", *SCHEMAS[table]])
+        if len(rows) < page_size:
+            return
+        last_id = rows[-1]["id"]
+
+
+def _arrow_schema(table):
+    """Schéma Parquet de l'export : le même pour toutes les pages, y compris un export vide."""
+    import pyarrow as pa  # Import différé : pyarrow ne sert qu'aux fichiers Parquet
+
+    types = {"int32": pa.int64(), "int64": pa.int64(), "float32": pa.float64()}
+    columns = {"id": "int64", "date": None, **DTYPES[table]}
+    return pa.schema([(column, types.get(dtype, pa.string())) for column, dtype in columns.items()])
+
+
+def export_file(client, user_id, table, file_format="csv", page_size=EXPORT_PAGE_SIZE):
+    """Écrit l'historique de l'utilisateur dans un fichier temporaire, page par page.
+
+    Seule une page est en mémoire à la fois. Renvoie le chemin du fichier, à supprimer par l'appelant.
+    """
+    fd, path = tempfile.mkstemp(suffix=f".{file_format}")
+    os.close(fd)
+    writer = None
+    try:
+        if file_format == "parquet":
+            import pyarrow as pa  # Import différé : pyarrow ne sert qu'aux fichiers Parquet
+            import pyarrow.parquet as pq
+
+            # Écrivain ouvert d'emblée : un export sans ligne reste un fichier Parquet valide
+            schema = _arrow_schema(table)
+            writer = pq.ParquetWriter(path, schema)
+        for i, page in enumerate(iter_pages(client, user_id, table, page_size)):
+            if writer is not None:
+                writer.write_table(pa.Table.from_pandas(page, schema=schema, preserve_index=False))
+            else:
+                page.to_csv(path, mode="a", header=i == 0, index=False)
+        if file_format == "csv" and os.path.getsize(path) == 0:
+            pd.DataFrame(columns=["id", *SCHEMAS[table]]).to_csv(path, index=False)
+    except Exception:
+        os.remove(path)
+        raise
+    finally:
+        if writer is not None:
+            writer.close()
+    return path
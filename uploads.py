@@ -0,0 +1,61 @@
+"""Envoi des photos de repas vers Supabase Storage."""
+import contextvars
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from images import IMAGE_CONTENT_TYPE, IMAGE_EXTENSION, process_images
+
+PHOTOS_BUCKET = "photos"
+
+
+def _upload_one(client, file_name, data):
+    """Envoie un objet et renvoie son chemin dans le bucket."""
+    client.storage.from_(PHOTOS_BUCKET).upload(file_name, data, {"content-type": IMAGE_CONTENT_TYPE})
+    return file_name
+
+
+def _upload_photo(client, meal_id, processed):
+    """Envoie l'image et sa miniature ; renvoie leurs chemins."""
+    image, thumbnail = processed
+    base_name = f"meals/{meal_id}_{uuid.uuid4()}"
+    return (
+        _upload_one(client, f"{base_name}.{IMAGE_EXTENSION}", image),
+        _upload_one(client, f"{base_name}_thumb.{IMAGE_EXTENSION}", thumbnail),
+    )
+
+
+def upload_meal_photos(client, public_url_prefix, meal_id, uploaded_files, max_workers=4):
+    """Redimensionne puis envoie les photos d'un repas en parallèle.
+
+    Renvoie les lignes `meal_photos` à insérer pour les envois réussis, et la liste
+    des (nom du fichier, erreur) pour ceux qui ont échoué.
+    """
+    if not uploaded_files:
+        return [], []
+
+    # Décodage, redimensionnement et miniatures dans le pool de processus
+    processed = process_images([uploaded_file.getvalue() for uploaded_file in uploaded_files])
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(uploaded_files))) as executor:
+        # Chaque envoi reçoit une copie du contexte : ses requêtes restent rattachées à l'exécution en cours
+        futures = [
+            None if isinstance(result, Exception)
+            else executor.submit(contextvars.copy_context().run, _upload_photo, client, meal_id, result)
+            for result in processed
+        ]
+
+    rows, errors = [], []
+    for uploaded_file, result, future in zip(uploaded_files, processed, futures):
+        try:
+            if future is None:
+                raise result
+            image_name, thumbnail_name = future.result()
+        except Exception as e:
+            errors.append((uploaded_file.name, str(e)))
+        else:
+            rows.append({
+                "meal_id": meal_id,
+                "photo_url": f"{public_url_prefix}/{image_name}",
+                "thumbnail_url": f"{public_url_prefix}/{thumbnail_name}",
+            })
+    return rows, errors
@@ -0,0 +1 @@
+"""Pages de l'application, importées uniquement lorsqu'elles sont affichées."""
@@ -0,0 +1,56 @@
+"""Pages d'authentification : inscription, connexion et profil."""
+import streamlit as st
+
+from supabase_client import session_user
+
+
+def render_sign_up(supabase, repository):
+    """Page « Inscription »."""
+    st.header("Créer un compte")
+    email = st.text_input("Email")
+    password = st.text_input("Mot de passe", type="password")
+    if st.button("S'inscrire"):
+        try:
+            response = supabase.auth.sign_up({
+                "email": email,
+                "password": password
+            })
+            if response.user:
+                st.success("Inscription réussie ! Un email de vérification a été envoyé.")
+            elif response.error:
+                st.error(f"Erreur : {response.error['message']}")
+            else:
+                st.error("Une erreur inconnue s'est produite.")
+        except Exception as e:
+            st.error(f"Erreur inattendue : {str(e)}")
+
+
+def render_sign_in(supabase, repository):
+    """Page « Connexion »."""
+    st.header("Se connecter")
+    email = st.text_input("Email")
+    password = st.text_input("Mot de passe", type="password")
+    if st.button("Connexion"):
+        try:
+            response = supabase.auth.sign_in_with_password({"email": email, "password": password})
+            if response.user:
+                st.success("Connexion réussie !")
+                st.session_state["user"] = session_user(response.session, response.user)
+            else:
+                st.error(f"Erreur : {response.get('error', {}).get('message', 'Erreur inconnue')}")
+
+        except Exception as e:
+            st.error(f"Erreur inattendue : {str(e)}")
+
+
+def render_profile(supabase, repository):
+    """Page « Mon Profil »."""
+    if st.session_state["user"] is None:
+        st.warning("Veuillez vous connecter pour accéder à votre profil.")
+    else:
+        user = st.session_state["user"]
+        st.header("Votre Profil")
+        st.markdown(f"**Email** : {user['email']}")
+        if st.button("Déconnexion"):
+            st.session_state["user"] = None
+            st.success("Vous avez été déconnecté.")
@@ -0,0 +1,32 @@
+"""Éléments d'interface partagés par plusieurs pages."""
+import math
+
+import streamlit as st
+
+from repository import DEFAULT_PAGE_SIZE
+
+
+# Sélecteur de page pour les listes paginées côté serveur
+def current_page(key):
+    """Renvoie l'index (à partir de 0) de la page choisie pour la liste `key`."""
+    return st.session_state.get(key, 1) - 1
+
+
+def page_selector(key, total, page_size=DEFAULT_PAGE_SIZE):
+    """Affiche le choix de page, borné par le nombre total de lignes."""
+    page_count = max(1, math.ceil(total / page_size))
+    if st.session_state.get(key, 1) > page_count:
+        st.session_state[key] = page_count
+    st.number_input(f"Page (sur {page_count})", min_value=1, max_value=page_count, step=1, key=key)
+
+
+# Fonction pour ajouter un pictogramme en fonction du type d'entraînement
+def get_training_icon(training_type):
+    icons = {
+        "Course": "🏃‍♂️",
+        "Vélo": "🚴‍♀️",
+        "Musculation": "🏋️‍♂️",
+        "Natation": "🏊‍♀️",
+        "Marche": "🚶‍♂️",
+    }
+    return icons.get(training_type, "❓")  # Par défaut, un point d'interrogation
@@ -0,0 +1,45 @@
+"""Panneau de diagnostic : détail de l'exécution en cours et profilage."""
+import cProfile
+import io
+import pstats
+
+import streamlit as st
+
+from metrics import REGISTRY
+
+PROFILE_LINES = 25  # Fonctions affichées dans le profil
+
+
+def profiled(render_page, supabase, repository):
+    """Affiche la page sous cProfile puis les fonctions les plus coûteuses (temps cumulé)."""
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        render_page(supabase, repository)
+    finally:
+        profiler.disable()
+        output = io.StringIO()
+        pstats.Stats(profiler, stream=output).sort_stats("cumulative").print_stats(PROFILE_LINES)
+        with st.sidebar.expander("Profil de l'exécution"):
+            st.code(output.getvalue())
+
+
+def render_debug_panel(trace):
+    """Durée de l'exécution et appels mesurés (Supabase, HTTP, page), par cible."""
+    with st.sidebar.expander("Diagnostic", expanded=True):
+        st.caption(f"Exécution : {trace.elapsed() * 1000:.0f} ms")
+        rows = [
+            {
+                "type": kind,
+                "cible": target,
+                "appels": entry["calls"],
+                "ms": round(entry["seconds"] * 1000, 1),
+                "octets": entry["bytes"],
+            }
+            for (kind, target), entry in sorted(trace.summary().items())
+        ]
+        if rows:
+            st.dataframe(rows, hide_index=True)
+        else:
+            st.caption("Aucun appel mesuré.")
+        st.download_button("Métriques (Prometheus)", REGISTRY.to_prometheus(), file_name="metrics.txt")
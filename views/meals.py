@@ -0,0 +1,91 @@
+"""Pages des repas : ajout avec photos et liste paginée."""
+import streamlit as st
+
+from views.common import current_page, page_selector
+
+
+def render_add_meal(supabase, repository):
+    """Page « Ajouter un repas »."""
+    if st.session_state["user"] is None:
+        st.warning("Veuillez vous connecter pour ajouter un repas.")
+    else:
+        st.header("Ajouter un repas")
+        name = st.text_input("Nom du repas")
+        calories = st.slider("Calories", 0, 5000, 0)
+        proteins = st.slider("Protéines (g)", 0, 100, 0)
+        carbs = st.slider("Glucides (g)", 0, 100, 0)
+        fats = st.slider("Lipides (g)", 0, 100, 0)
+
+        uploaded_files = st.file_uploader(
+            "Téléchargez une ou plusieurs photos du repas", type=["png", "jpg", "jpeg"], accept_multiple_files=True
+        )
+
+        if st.button("Ajouter"):
+            try:
+                user_id = st.session_state["user"]["id"]
+                meal_data = {
+                    "user_id": user_id,
+                    "name": name,
+                    "calories": calories,
+                    "proteins": proteins,
+                    "carbs": carbs,
+                    "fats": fats,
+                }
+                meal_response = repository.add_meal(meal_data)
+                if meal_response.data:
+                    meal_id = meal_response.data[0]["id"]
+                    # Import différé : Pillow n'est chargé qu'à l'envoi de photos
+                    from uploads import PHOTOS_BUCKET, upload_meal_photos
+
+                    # Envois parallèles vers Storage puis une seule insertion pour toutes les photos
+                    photo_rows, upload_errors = upload_meal_photos(
+                        supabase,
+                        f"{st.secrets['SUPABASE_URL']}/storage/v1/object/public/{PHOTOS_BUCKET}",
+                        meal_id,
+                        uploaded_files,
+                    )
+                    repository.add_meal_photos(user_id, photo_rows)
+                    for file_name, error in upload_errors:
+                        st.warning(f"La photo {file_name} n'a pas pu être envoyée : {error}")
+                    st.success("Repas ajouté avec succès !")
+                else:
+                    st.error("Erreur lors de l'ajout du repas.")
+            except Exception as e:
+                st.error(f"Erreur inattendue : {str(e)}")
+
+
+def render_meals(supabase, repository):
+    """Page « Voir les repas »."""
+    if st.session_state["user"] is None:
+        st.warning("Veuillez vous connecter pour voir vos repas.")
+    else:
+        st.header("Vos repas")
+
+        user_id = st.session_state["user"]["id"]
+        meals, total_meals = repository.get_meals_page(user_id, current_page("meals_page"))
+
+        if not total_meals:
+            st.info("Aucun repas enregistré.")
+        else:
+            # Une seule requête (par lot) pour toutes les photos au lieu d'une par repas
+            photos_by_meal = repository.get_meals_photos(user_id, [meal["id"] for meal in meals])
+            for meal in meals:
+                photos = photos_by_meal.get(meal["id"], [])
+
+                col1, col2 = st.columns([3, 1])  # Disposition : Infos à gauche, photo à droite
+                with col1:
+                    st.subheader(f"🍴 {meal['name']}")  # Titre en gras avec emoji
+                    st.write(f"**Calories**: {meal['calories']} kcal")
+                    st.write(f"**Protéines**: {meal['proteins']} g")
+                    st.write(f"**Glucides**: {meal['carbs']} g")
+                    st.write(f"**Lipides**: {meal['fats']} g")
+
+                with col2:
+                    if photos:
+                        st.image(photos[0]["thumbnail_url"] or photos[0]["photo_url"], width=200)  # Miniature harmonieuse
+                    else:
+                        st.write("Pas de photo.")
+
+                st.markdown("---")  # Séparation visuelle
+
+            page_selector("meals_page", total_meals)
@@ -0,0 +1,187 @@
+"""Page « Suggestions personnalisées » : bilan de la semaine, prédiction et recettes."""
+import numpy as np
+import pandas as pd
+import requests
+import streamlit as st
+
+from model_store import ModelStore
+from repository import TRAINING_TYPES
+from spoonacular import FIND_BY_NUTRIENTS_URL, SpoonacularClient, SpoonacularError
+from views.common import get_training_icon
+
+
+# Client Spoonacular partagé par le processus : catalogue local, cache persistant et requêtes regroupées
+@st.cache_resource
+def get_spoonacular_client():
+    client = SpoonacularClient(
+        st.secrets["SPOONACULAR_API_KEY"],  # Ajoutez votre clé API dans les secrets
+        url=st.secrets.get("SPOONACULAR_URL", FIND_BY_NUTRIENTS_URL),  # Autre serveur (bancs d'essai)
+    )
+    if "RECIPE_CATALOG_PATH" in st.secrets:  # Catalogue de recettes fourni en CSV
+        client.index.import_csv(st.secrets["RECIPE_CATALOG_PATH"])
+    return client
+
+
+# Fonction pour appeler l'API Spoonacular
+def get_recipes_from_spoonacular(profiles):
+    """Récupère des recettes pour chaque profil (calories, protéines, glucides, lipides) via Spoonacular."""
+    if not profiles:
+        return []
+    try:
+        return get_spoonacular_client().find_many(profiles)
+    except (SpoonacularError, requests.RequestException) as e:
+        st.error(f"Erreur API Spoonacular : {e}")
+        return [[] for _ in profiles]
+
+
+# Modèles prédictifs partagés par le processus, recalculés seulement si les entraînements changent
+@st.cache_resource
+def get_model_store():
+    return ModelStore()
+
+
+# Modèle prédictif pour les calories brûlées
+def train_predictive_model(user_id, trainings):
+    """Renvoie le modèle de régression (calories ~ durée, par type d'entraînement) de l'utilisateur."""
+    if len(trainings) < 5:  # Vérifier qu'il y a assez de données
+        st.warning("Pas assez de données d'entraînement pour le modèle prédictif.")
+        return None
+
+    model = get_model_store().get_model(user_id, trainings)
+    st.write("Précision du modèle (R²) :", model.score())
+    return model
+
+
+def render_suggestions(supabase, repository):
+    """Page « Suggestions personnalisées »."""
+    if st.session_state["user"] is None:
+        st.warning("Veuillez vous connecter pour voir vos suggestions.")
+    else:
+        st.header("Suggestions personnalisées")
+
+        user_id = st.session_state["user"]["id"]
+        sections = [
+            section for section in (_render_weekly_balance(repository, user_id), _render_prediction(repository, user_id))
+            if section is not None
+        ]
+        # Recettes des deux sections cherchées ensemble : catalogue local en une fois, appels API en parallèle
+        recipes = get_recipes_from_spoonacular([needs for needs, _ in sections])
+        for (_, show_recipes), section_recipes in zip(sections, recipes):
+            show_recipes(section_recipes)
+
+        recipe_stats = get_spoonacular_client().stats()
+        st.sidebar.caption(
+            f"Recettes : {recipe_stats['catalog_size']} au catalogue local, {recipe_stats['hit_rate']:.0%} de hits, "
+            f"{recipe_stats['upstream_calls']} appels API ({recipe_stats['avg_upstream_ms']:.0f} ms en moyenne)"
+        )
+
+
+def _render_weekly_balance(repository, user_id):
+    """Bilan calorique de la semaine et recettes pour combler l'écart.
+
+    Renvoie (besoins, affichage des recettes) ou None : les recettes sont cherchées par l'appelant.
+    """
+    # Seuls les totaux de la semaine sont nécessaires : agrégation côté Supabase
+    totals = repository.get_calorie_totals(user_id, period="week")
+
+    if not totals["training_count"]:
+        st.info("Aucun entraînement trouvé cette semaine pour générer des suggestions.")
+    elif not totals["meal_count"]:
+        st.info("Aucun repas trouvé cette semaine pour générer des suggestions.")
+    else:
+        total_burned = totals["calories_burned"]
+        total_calories = totals["calories_consumed"]
+
+        st.markdown(f"### **Calories brûlées cette semaine** : {total_burned} kcal")
+        st.markdown(f"### **Calories consommées cette semaine** : {total_calories} kcal")
+
+        # Suggestions basées sur le déficit calorique
+        deficit = total_burned - total_calories
+        if deficit > 0:
+            st.success(
+                f"Vous avez un déficit calorique de {deficit} kcal. Nous vous recommandons de consommer des repas plus caloriques."
+            )
+        else:
+            st.warning(
+                f"Vous avez un surplus calorique de {-deficit} kcal. Essayez de réduire les calories dans vos repas."
+            )
+
+        # Calcul des besoins nutritionnels pour Spoonacular
+        predicted_calories = abs(deficit)  # Déficit ou surplus converti en absolu pour ajuster les besoins
+        proteins_needed = 50 if predicted_calories > 400 else 30
+        carbs_needed = 100 if predicted_calories > 600 else 50
+        fats_needed = 20
+
+        st.markdown(f"### Besoins estimés pour combler l'écart :")
+        st.write(f"- Calories : {predicted_calories} kcal")
+        st.write(f"- Protéines : {proteins_needed} g")
+        st.write(f"- Glucides : {carbs_needed} g")
+        st.write(f"- Lipides : {fats_needed} g")
+
+        # Emplacement des recettes, remplies une fois la recherche terminée
+        st.markdown("### Recettes suggérées :")
+        placeholder = st.container()
+
+        def show_recipes(recipes):
+            with placeholder:
+                if recipes:
+                    for recipe in recipes:
+                        st.markdown(f"### {recipe['title']}")
+                        st.image(recipe["image"], width=300)  # Ajuster uniquement la largeur
+                        st.write(f"Calories : {recipe['calories']} kcal")
+                        st.write(f"[Voir la recette complète](https://spoonacular.com/recipes/{recipe['id']})")
+                else:
+                    st.error("Aucune recette trouvée correspondant aux besoins nutritionnels.")
+
+        return (predicted_calories, proteins_needed, carbs_needed, fats_needed), show_recipes
+    return None
+
+
+def _render_prediction(repository, user_id):
+    """Prédiction des calories du prochain entraînement et recettes associées.
+
+    Renvoie (besoins, affichage des recettes) ou None, comme `_render_weekly_balance`.
+    """
+    trainings = repository.get_trainings_frame(user_id)
+    _, meal_count = repository.get_meals_page(user_id, page_size=1)  # Seul le nombre de repas est utile ici
+
+    if trainings.empty or not meal_count:
+        st.info("Ajoutez plus de données pour générer des suggestions.")
+    else:
+        # Entraîner un modèle prédictif
+        model = train_predictive_model(user_id, trainings)
+
+        if model:
+            # Prédire les calories pour un nouvel entraînement
+            next_training_type = st.selectbox("Type du prochain entraînement", TRAINING_TYPES)
+            next_training_duration = st.slider("Durée du prochain entraînement (min)", 10, 120, 30)
+            predicted_calories = model.predict([next_training_duration], next_training_type)[0]
+            st.write(f"Calories estimées pour le prochain entraînement : {predicted_calories:.2f} kcal")
+
+            # Courbes de calories estimées par activité, calculées en un seul appel vectorisé
+            candidate_durations = np.arange(10, 121, 5)
+            curves = model.predict_curves(candidate_durations)
+            st.line_chart(pd.DataFrame(
+                curves.T,
+                index=pd.Index(candidate_durations, name="Durée (min)"),
+                columns=[f"{get_training_icon(t)} {t}" for t in TRAINING_TYPES],
+            ))
+
+            # Calcul des besoins nutritionnels
+            proteins_needed = 50 if predicted_calories > 400 else 30
+            carbs_needed = 100 if predicted_calories > 600 else 50
+            fats_needed = 20
+
+            # Afficher les recettes
+            st.subheader("Recettes suggérées")
+            placeholder = st.container()
+
+            def show_recipes(recipes):
+                with placeholder:
+                    for recipe in recipes:
+                        st.markdown(f"### {recipe['title']}")
+                        st.image(recipe["image"])
+                        st.write(f"Calories : {recipe['calories']} kcal")
+
+            return (predicted_calories, proteins_needed, carbs_needed, fats_needed), show_recipes
+    return None
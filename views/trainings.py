@@ -0,0 +1,87 @@
+"""Pages des entraînements : ajout et tableau paginé."""
+from datetime import datetime
+
+import streamlit as st
+
+from repository import TRAINING_TYPES
+from views.common import current_page, get_training_icon, page_selector
+
+
+def render_add_training(supabase, repository):
+    """Page « Ajouter un entraînement »."""
+    if st.session_state["user"] is None:
+        st.warning("Veuillez vous connecter pour ajouter un entraînement.")
+    else:
+        st.header("Ajouter un entraînement")
+
+        training_type = st.selectbox(
+            "Type d’entraînement", TRAINING_TYPES
+        )
+        date = st.date_input("Date de l’entraînement", value=datetime.now())
+        duration = st.slider("Durée (en minutes)", 0, 300, 60)
+        calories_burned = st.slider("Calories brûlées", 0, 2000, 300)
+
+        if st.button("Ajouter l’entraînement"):
+            user_id = st.session_state["user"]["id"]
+            response = repository.add_training(user_id, training_type, date, duration, calories_burned)
+            if response.data:
+                st.success("Entraînement ajouté avec succès !")
+            else:
+                st.error("Erreur lors de l'ajout de l'entraînement.")
+
+
+def render_trainings(supabase, repository):
+    """Page « Voir les entraînements »."""
+    # Imports différés : pandas et AgGrid ne servent qu'au tableau
+    from frames import trainings_frame
+    from st_aggrid import AgGrid
+    from st_aggrid.grid_options_builder import GridOptionsBuilder
+
+    if st.session_state["user"] is None:
+        st.warning("Veuillez vous connecter pour voir vos entraînements.")
+    else:
+        st.header("Vos entraînements")
+
+        user_id = st.session_state["user"]["id"]
+        trainings, total_trainings = repository.get_trainings_page(user_id, current_page("trainings_page"))
+
+        if not total_trainings:
+            st.info("Aucun entraînement enregistré.")
+        else:
+            # Convertir les données en colonnes typées
+            df = trainings_frame(trainings)
+
+            # Ajouter les colonnes formatées pour un meilleur affichage
+            df["Icone"] = df["training_type"].map(get_training_icon).astype(str)
+            df["Date"] = df["date"].dt.strftime("%d %b %Y")  # Format : 01 Jan 2024
+            df["Durée (min)"] = df["duration"]
+            df["Calories brûlées"] = df["calories_burned"]
+
+            # Garder uniquement les colonnes nécessaires
+            display_df = df[["Icone", "Date", "training_type", "Durée (min)", "Calories brûlées"]]
+            display_df.rename(
+                columns={
+                    "Icone": "Type",
+                    "training_type": "Activité",
+                },
+                inplace=True,
+            )
+
+            # Utiliser AgGrid pour un tableau interactif
+            gb = GridOptionsBuilder.from_dataframe(display_df)
+            gb.configure_column("Type", width=70)  # Ajuster la largeur de la colonne "Type"
+            gb.configure_column("Activité", width=150)  # Ajuster la largeur de la colonne "Activité"
+            gb.configure_column("Durée (min)", width=100)  # Ajuster la largeur de la colonne "Durée (min)"
+            gb.configure_column("Calories brûlées", width=150)  # Ajuster la largeur de la colonne "Calories brûlées"
+
+            grid_options = gb.build()
+
+            st.markdown("### Tableau des entraînements")
+            AgGrid(
+                display_df,
+                gridOptions=grid_options,
+                theme="balham",  # Thème clair
+                fit_columns_on_grid_load=True,  # Adapter les colonnes à la largeur
+            )
+            # La pagination est faite par Supabase : seule la page affichée est chargée
+            page_selector("trainings_page", total_trainings)
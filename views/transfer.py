@@ -0,0 +1,56 @@
+"""Page d'import et d'export en lot de l'historique."""
+import os
+
+import streamlit as st
+
+TABLE_LABELS = {"Repas": "meals", "Entraînements": "trainings"}
+
+
+def render_transfer(supabase, repository):
+    """Page « Importer / Exporter »."""
+    # Import différé : pandas n'est chargé que sur cette page
+    from transfer import SCHEMAS, ImportFormatError, export_file, import_file
+
+    if st.session_state["user"] is None:
+        st.warning("Veuillez vous connecter pour importer ou exporter vos données.")
+        return
+
+    user_id = st.session_state["user"]["id"]
+    st.header("Importer / Exporter")
+    table = TABLE_LABELS[st.radio("Données", list(TABLE_LABELS), horizontal=True)]
+
+    st.subheader("Importer")
+    st.caption(f"Colonnes attendues : {', '.join(SCHEMAS[table])}")
+    uploaded_file = st.file_uploader("Fichier CSV ou Parquet", type=["csv", "parquet"])
+    if uploaded_file is not None and st.button("Importer"):
+        try:
+            with st.spinner("Import en cours..."):
+                summary = import_file(supabase, user_id, table, uploaded_file, uploaded_file.name)
+        except ImportFormatError as e:
+            st.error(str(e))
+        except Exception as e:
+            st.error(f"Erreur inattendue : {str(e)}")
+        else:
+            st.success(
+                f"{summary['imported']} ligne(s) importée(s), {summary['skipped']} déjà présente(s), "
+                f"{summary['rejected']} rejetée(s)."
+            )
+            for row, message in summary["errors"]:
+                st.warning(f"Ligne {row} : {message}")
+        finally:
+            # Une partie des lots a pu être envoyée même en cas d'erreur
+            repository.invalidate(user_id)
+
+    st.subheader("Exporter")
+    file_format = st.selectbox("Format", ["csv", "parquet"])
+    if st.button("Préparer l'export"):
+        try:
+            path = export_file(supabase, user_id, table, file_format)
+        except Exception as e:
+            st.error(f"Erreur inattendue : {str(e)}")
+        else:
+            try:
+                with open(path, "rb") as f:
+                    st.download_button("Télécharger", f, file_name=f"{table}.{file_format}")
+            finally:
+                os.remove(path)
@@ -0,0 +1,44 @@
+"""Page « Visualisations avancées »."""
+import streamlit as st
+
+import charts
+from timeseries import calorie_series, downsample
+
+PERIOD_LABELS = {"Jour": "day", "Semaine": "week", "Mois": "month"}
+
+
+# Rendus mis en cache selon les données (st.cache_data hache les arguments) : une
+# exécution sans nouvelle donnée ne redessine rien.
+@st.cache_data(max_entries=128, show_spinner=False)
+def calories_chart(burned, consumed, rolling_net):
+    return charts.calories_chart(burned, consumed, rolling_net)
+
+
+@st.cache_data(max_entries=128, show_spinner=False)
+def durations_histogram(durations):
+    return charts.durations_histogram(durations)
+
+
+def render_visualisations(supabase, repository):
+    """Page « Visualisations avancées »."""
+    if st.session_state["user"] is None:
+        st.warning("Veuillez vous connecter pour accéder aux visualisations.")
+    else:
+        st.header("Visualisations avancées")
+
+        user_id = st.session_state["user"]["id"]
+        trainings = repository.get_trainings_frame(user_id)
+        meals = repository.get_meals_frame(user_id)
+
+        if trainings.empty or meals.empty:
+            st.info("Données insuffisantes pour générer des visualisations.")
+        else:
+            # Calories alignées sur un index commun, agrégées par période puis limitées à MAX_POINTS points
+            period = PERIOD_LABELS[st.radio("Période", list(PERIOD_LABELS), horizontal=True)]
+            series = calorie_series(trainings, meals, period)
+            st.image(calories_chart(
+                downsample(series["burned"]), downsample(series["consumed"]), downsample(series["rolling_net"])
+            ))
+
+            # Histogramme des durées d'entraînement
+            st.image(durations_histogram(trainings["duration"].to_numpy()))